@@ -7,6 +7,7 @@ Following SOLID principles and DRY approach.
 
 import os
 from pathlib import Path
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -209,6 +210,22 @@ REQUEST_LOG_EXCLUDED_METHODS = ['OPTIONS']
 
 REQUEST_LOG_AUTHENTICATED_ONLY = False
 
+# Write request logs from a background thread in batches instead of one INSERT per request
+REQUEST_LOG_BUFFERED = False
+REQUEST_LOG_BATCH_SIZE = 500
+REQUEST_LOG_FLUSH_INTERVAL = 0.2  # seconds
+
+# Fraction of requests logged per status class ('2xx', '3xx', ...); missing classes log everything.
+# Authenticated non-GET requests are always logged.
+REQUEST_LOG_SAMPLE_RATE = {}
+
+# Store request log partitions as PostgreSQL UNLOGGED tables: no WAL per insert, but rows
+# are lost on a crash and not replicated. Applied by migrations and create_request_log_partitions.
+REQUEST_LOG_UNLOGGED = False
+
+# Days of request logs kept by the prune_request_logs command
+REQUEST_LOG_RETENTION_DAYS = 30
+
 # Cache Configuration
 CACHES = {
     'default': {
@@ -235,6 +252,13 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_BEAT_SCHEDULE = {
+    # Idempotent, so running daily keeps a few months of partitions ready ahead of time
+    'create-request-log-partitions': {
+        'task': 'audit.tasks.create_request_log_partitions',
+        'schedule': crontab(hour=0, minute=30),
+    },
+}
 
 # Email Configuration
 EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
@@ -246,3 +270,6 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@cvproject.com')
 SERVER_EMAIL = os.environ.get('SERVER_EMAIL', DEFAULT_FROM_EMAIL)
+
+# Jobs sent over one SMTP connection by send_cv_pdf_emails_batch
+CV_EMAIL_BATCH_SIZE = int(os.environ.get('CV_EMAIL_BATCH_SIZE', '50'))
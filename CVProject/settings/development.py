@@ -19,15 +19,24 @@ EMAIL_BACKEND = os.environ.get(
 )
 
 # Development-specific settings
+# Debug toolbar is opt-in via DJANGO_DEBUG_TOOLBAR=1 (new lists so base settings are not mutated)
+if DEBUG and os.environ.get('DJANGO_DEBUG_TOOLBAR') == '1':
+    INSTALLED_APPS = [*INSTALLED_APPS, 'debug_toolbar']
+    MIDDLEWARE = [*MIDDLEWARE, 'debug_toolbar.middleware.DebugToolbarMiddleware']
+    INTERNAL_IPS = ['127.0.0.1', 'localhost']
+
+# App/middleware/logging configuration is only exposed to templates while debugging
 if DEBUG:
-    # Add debug toolbar if available
-    try:
-        import debug_toolbar
-        INSTALLED_APPS += ['debug_toolbar']
-        MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
-        INTERNAL_IPS = ['127.0.0.1', 'localhost']
-    except ImportError:
-        pass
+    TEMPLATES = [{
+        **TEMPLATES[0],
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'context_processors': [
+                *TEMPLATES[0]['OPTIONS']['context_processors'],
+                'main.context_processors.debug_settings_context',
+            ],
+        },
+    }]
 
 # CORS settings for development
 CORS_ALLOW_ALL_ORIGINS = True
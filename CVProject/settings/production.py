@@ -32,6 +32,9 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD'),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        # Reuse connections across requests instead of reconnecting every time
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -55,6 +58,14 @@ CACHES = {
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
 
+# Request logging
+REQUEST_LOG_BUFFERED = True
+# Sampling and UNLOGGED partitions both trade audit completeness for write throughput,
+# so they stay off unless a deployment opts in
+_success_sample_rate = float(os.environ.get('REQUEST_LOG_SUCCESS_SAMPLE_RATE', '1.0'))
+REQUEST_LOG_SAMPLE_RATE = {'2xx': _success_sample_rate, '3xx': _success_sample_rate, '4xx': 1.0, '5xx': 1.0}
+REQUEST_LOG_UNLOGGED = os.environ.get('REQUEST_LOG_UNLOGGED', 'False').lower() == 'true'
+
 # Logging configuration for production
 LOGGING['handlers']['file']['filename'] = '/var/log/django/cvproject.log'
 LOGGING['loggers']['django']['level'] = 'WARNING'
@@ -1,9 +1,89 @@
+from functools import lru_cache
 from django.contrib import admin
-from django.utils.html import format_html
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.html import escape
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from .constants import FILTER_STATUS_CODES
 from .models import RequestLog
 
+_PATH_TMPL = '<span title="%s">%s...</span>'
+_USER_TMPL = '<a href="%s">%s</a>'
+_STATUS_TMPL = '<span style="color: %s; font-weight: bold;">%d</span>'
+_RESPONSE_TIME_TMPL = '<span style="color: %s;">%dms</span>'
+_USER_AGENT_TMPL = (
+    '<div style="max-width: 400px; word-wrap: break-word; font-family: monospace; font-size: 11px;">%s</div>'
+)
+
+STATUS_CLASS_COLORS = {2: 'green', 4: 'orange', 5: 'red'}
+
+
+@lru_cache(maxsize=1)
+def _user_change_url_template():
+    return reverse('admin:auth_user_change', args=['__pk__'])
+
+
+def user_change_url(pk):
+    return _user_change_url_template().replace('__pk__', str(pk))
+
+
+class ResponseStatusFilter(admin.SimpleListFilter):
+    title = 'response status'
+    parameter_name = 'response_status'
+
+    def lookups(self, request, model_admin):
+        # Same static list as the logs page, so the changelist never scans the table for options
+        return [(status, status) for status in FILTER_STATUS_CODES]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(response_status=self.value())
+        return queryset
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reads the row count of an unfiltered table from PostgreSQL
+    planner statistics instead of running COUNT(*).
+    """
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql' or queryset.query.where:
+            return super().count
+
+        table = queryset.model._meta.db_table
+        with connection.cursor() as cursor:
+            # A partitioned table is estimated from its partitions, a plain table from itself
+            cursor.execute(
+                "SELECT COALESCE("
+                "(SELECT SUM(GREATEST(c.reltuples, 0)) FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = %s::regclass), "
+                "(SELECT GREATEST(reltuples, 0) FROM pg_class WHERE oid = %s::regclass)"
+                ")::bigint",
+                [table, table],
+            )
+            estimate = cursor.fetchone()[0]
+
+        # Statistics are unreliable on small or never-analyzed tables, and counting them is cheap
+        if estimate < self.exact_count_threshold:
+            return super().count
+        return estimate
+
+
+class RequestLogChangeList(ChangeList):
+    def get_queryset(self, request):
+        return super().get_queryset(request).only(
+            'id', 'timestamp', 'http_method', 'path', 'response_status',
+            'response_time_ms', 'remote_ip', 'user__id', 'user__username'
+        )
+
 
 @admin.register(RequestLog)
 class RequestLogAdmin(admin.ModelAdmin):
@@ -12,7 +92,7 @@ class RequestLogAdmin(admin.ModelAdmin):
         'response_status_display', 'response_time_display', 'remote_ip'
     ]
     list_filter = [
-        'http_method', 'response_status', 'is_authenticated',
+        'http_method', ResponseStatusFilter, 'is_authenticated',
         'is_staff', 'is_superuser', 'timestamp'
     ]
     search_fields = ['path', 'remote_ip', 'user__username', 'user__email']
@@ -20,11 +100,14 @@ class RequestLogAdmin(admin.ModelAdmin):
         'timestamp', 'http_method', 'path', 'query_string', 'remote_ip',
         'user_agent', 'user', 'response_status', 'response_time_ms',
         'request_size_bytes', 'response_size_bytes', 'is_authenticated',
-        'is_staff', 'is_superuser', 'user_agent_display'
+        'is_staff', 'is_superuser', 'sampled', 'user_agent_display'
     ]
+    list_select_related = ('user',)
     ordering = ['-timestamp']
     date_hierarchy = 'timestamp'
     list_per_page = 50
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         ('Request Information', {
@@ -34,7 +117,7 @@ class RequestLogAdmin(admin.ModelAdmin):
             'fields': ('user', 'is_authenticated', 'is_staff', 'is_superuser')
         }),
         ('Response Information', {
-            'fields': ('response_status', 'response_time_ms', 'request_size_bytes', 'response_size_bytes')
+            'fields': ('response_status', 'response_time_ms', 'request_size_bytes', 'response_size_bytes', 'sampled')
         }),
         ('Additional Information', {
             'fields': ('user_agent_display',),
@@ -44,22 +127,14 @@ class RequestLogAdmin(admin.ModelAdmin):
 
     def path_display(self, obj):
         if len(obj.path) > 50:
-            return format_html(
-                '<span title="{}">{}...</span>',
-                obj.path,
-                obj.path[:50]
-            )
+            return mark_safe(_PATH_TMPL % (escape(obj.path), escape(obj.path[:50])))
         return obj.path
     path_display.short_description = 'Path'
 
     def user_display(self, obj):
         if obj.user:
-            url = reverse('admin:auth_user_change', args=[obj.user.pk])
-            return format_html(
-                '<a href="{}">{}</a>',
-                url,
-                obj.user.username
-            )
+            url = user_change_url(obj.user.pk)
+            return mark_safe(_USER_TMPL % (escape(url), escape(obj.user.username)))
         return 'Anonymous'
     user_display.short_description = 'User'
 
@@ -67,20 +142,8 @@ class RequestLogAdmin(admin.ModelAdmin):
         if not obj.response_status:
             return '-'
 
-        if obj.is_successful:
-            color = 'green'
-        elif obj.is_client_error:
-            color = 'orange'
-        elif obj.is_server_error:
-            color = 'red'
-        else:
-            color = 'black'
-
-        return format_html(
-            '<span style="color: {}; font-weight: bold;">{}</span>',
-            color,
-            obj.response_status
-        )
+        color = STATUS_CLASS_COLORS.get(obj.response_status // 100, 'black')
+        return mark_safe(_STATUS_TMPL % (color, obj.response_status))
     response_status_display.short_description = 'Status'
 
     def response_time_display(self, obj):
@@ -94,21 +157,14 @@ class RequestLogAdmin(admin.ModelAdmin):
         else:
             color = 'red'
 
-        return format_html(
-            '<span style="color: {};">{}ms</span>',
-            color,
-            obj.response_time_ms
-        )
+        return mark_safe(_RESPONSE_TIME_TMPL % (color, obj.response_time_ms))
     response_time_display.short_description = 'Response Time'
 
     def user_agent_display(self, obj):
         if not obj.user_agent:
             return '-'
 
-        return format_html(
-            '<div style="max-width: 400px; word-wrap: break-word; font-family: monospace; font-size: 11px;">{}</div>',
-            obj.user_agent
-        )
+        return mark_safe(_USER_AGENT_TMPL % escape(obj.user_agent.ua_text))
     user_agent_display.short_description = 'User Agent'
 
     def has_add_permission(self, request):
@@ -120,5 +176,5 @@ class RequestLogAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         return request.user.is_superuser
 
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user')
\ No newline at end of file
+    def get_changelist(self, request, **kwargs):
+        return RequestLogChangeList
\ No newline at end of file
@@ -0,0 +1,120 @@
+import os
+import atexit
+import logging
+import threading
+from collections import deque
+from django.db import transaction, close_old_connections
+
+logger = logging.getLogger(__name__)
+
+MAX_PENDING = 10000
+
+# deque(maxlen=...) evicts the oldest entry on append, giving a drop-oldest overflow policy
+_pending = deque(maxlen=MAX_PENDING)
+_wakeup = threading.Event()
+_writer_lock = threading.Lock()
+_writer_pid = None
+_batch_size = 500
+_flush_interval = 0.2
+dropped_count = 0
+
+
+def configure(batch_size=500, flush_interval=0.2):
+    global _batch_size, _flush_interval
+    _batch_size = batch_size
+    _flush_interval = flush_interval
+
+
+def enqueue(payload):
+    """
+    Queue one RequestLog payload for the background writer.
+    """
+    global dropped_count
+    if _writer_pid != os.getpid():
+        start_writer()
+
+    if len(_pending) >= MAX_PENDING:
+        dropped_count += 1
+        if dropped_count % 1000 == 1:
+            logger.warning(f"Request log buffer is full, {dropped_count} oldest logs dropped so far")
+
+    _pending.append(payload)
+    if len(_pending) >= _batch_size:
+        _wakeup.set()
+
+
+def pending_count():
+    return len(_pending)
+
+
+def _take(max_items):
+    items = []
+    while len(items) < max_items:
+        try:
+            items.append(_pending.popleft())
+        except IndexError:
+            break
+    return items
+
+
+def load_models():
+    # Imported on first write so loading this module or the middleware doesn't pull in the model layer
+    from .models import RequestLog, UserAgent
+    return RequestLog, UserAgent
+
+
+def write_batch(items, batch_size):
+    RequestLog, UserAgent = load_models()
+    try:
+        with transaction.atomic():
+            user_agent_ids = UserAgent.objects.intern_many(
+                {data['user_agent'] for data in items}
+            )
+            for data in items:
+                data['user_agent_id'] = user_agent_ids.get(data.pop('user_agent'))
+
+            RequestLog.objects.bulk_create(
+                [RequestLog(**data) for data in items],
+                batch_size=batch_size,
+            )
+    except Exception as e:
+        logger.error(f"Failed to write {len(items)} request logs: {e}")
+
+
+def _writer_loop():
+    while True:
+        _wakeup.wait(_flush_interval)
+        _wakeup.clear()
+
+        items = _take(_batch_size)
+        if items:
+            close_old_connections()
+        while items:
+            write_batch(items, _batch_size)
+            items = _take(_batch_size)
+
+
+def start_writer():
+    """
+    Start the writer thread for this process; forked workers start their own.
+    """
+    global _writer_pid
+    with _writer_lock:
+        if _writer_pid == os.getpid():
+            return
+        threading.Thread(target=_writer_loop, name='request-log-writer', daemon=True).start()
+        _writer_pid = os.getpid()
+
+
+def flush(batch_size=None):
+    """
+    Synchronously write every request log still waiting in the buffer.
+    """
+    batch_size = batch_size or _batch_size
+    items = _take(batch_size)
+    while items:
+        write_batch(items, batch_size)
+        items = _take(batch_size)
+
+
+atexit.register(flush)
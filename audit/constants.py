@@ -0,0 +1,18 @@
+HTTP_METHOD_CHOICES = [
+    ('GET', 'GET'),
+    ('POST', 'POST'),
+    ('PUT', 'PUT'),
+    ('PATCH', 'PATCH'),
+    ('DELETE', 'DELETE'),
+    ('HEAD', 'HEAD'),
+    ('OPTIONS', 'OPTIONS'),
+    ('TRACE', 'TRACE'),
+]
+
+# Options for the filter dropdowns; listing them here avoids DISTINCT scans of the log table
+FILTER_HTTP_METHODS = tuple(method for method, _ in HTTP_METHOD_CHOICES)
+FILTER_STATUS_CODES = (
+    200, 201, 204, 301, 302, 304,
+    400, 401, 403, 404, 405, 429,
+    500, 502, 503, 504,
+)
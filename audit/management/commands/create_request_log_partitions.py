@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from ...partitions import add_months, create_monthly_partition, is_partitioned, month_start
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly partitions for the request log table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=3,
+            help='Number of months ahead (including the current one) to create partitions for',
+        )
+
+    def handle(self, *args, **options):
+        if not is_partitioned(connection):
+            self.stdout.write(
+                self.style.WARNING('Request log table is not partitioned, nothing to do')
+            )
+            return
+
+        current = month_start(timezone.now().date())
+        unlogged = getattr(settings, 'REQUEST_LOG_UNLOGGED', False)
+        with connection.cursor() as cursor:
+            for offset in range(options['months']):
+                name = create_monthly_partition(cursor, add_months(current, offset), unlogged=unlogged)
+                self.stdout.write(f'Partition {name} is ready')
+
+        self.stdout.write(
+            self.style.SUCCESS('Request log partitions are up to date')
+        )
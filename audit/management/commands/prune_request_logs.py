@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ...models import RequestLog
+from ...partitions import drop_partitions_before, is_partitioned
+
+
+class Command(BaseCommand):
+    help = 'Delete request logs older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'REQUEST_LOG_RETENTION_DAYS', 30),
+            help='Keep request logs from this many most recent days',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+
+        with transaction.atomic():
+            # Whole months past the cutoff go with a DROP TABLE instead of a row-by-row DELETE
+            if is_partitioned(connection):
+                with connection.cursor() as cursor:
+                    for name in drop_partitions_before(cursor, cutoff.date()):
+                        self.stdout.write(f'Dropped partition {name}')
+
+            # Nothing references request logs, so skip the collector and delete in one statement
+            queryset = RequestLog.objects.filter(timestamp__lt=cutoff)
+            deleted = queryset._raw_delete(queryset.db)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} request logs older than {options["days"]} days')
+        )
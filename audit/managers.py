@@ -1,7 +1,27 @@
-from django.db import models
+import hashlib
+from django.db import connections, models
+from django.db.models.functions import ExtractHour
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 
+ANALYTICS_CACHE_TIMEOUT = 60
+
+# GROUPING(path, ip, http_method, hour) sets a bit for every column left out of a grouping
+# set, first argument highest, so each single-column set gets its own code:
+# code -> (result name, output key, column position)
+_GROUPING_SETS = {
+    0b0111: ('top_paths', 'path', 0),
+    0b1011: ('top_ips', 'remote_ip', 1),
+    0b1101: ('method_distribution', 'http_method', 2),
+    0b1110: ('hourly_distribution', 'hour', 3),
+}
+# Methods and hours have only a handful of values each, so those sets are never cut to the top N
+_UNCUT_GROUPING_SETS = [
+    code for code, (name, _, _) in _GROUPING_SETS.items()
+    if name in ('method_distribution', 'hourly_distribution')
+]
+
 
 class RequestLogManager(models.Manager):
     def successful(self):
@@ -63,10 +83,16 @@ class RequestLogManager(models.Manager):
         return self.filter(response_size_bytes__gte=threshold_bytes)
 
     def get_stats(self):
-        total = self.count()
-        successful = self.successful().count()
-        client_errors = self.client_errors().count()
-        server_errors = self.server_errors().count()
+        agg = self.aggregate(
+            total=models.Count('id'),
+            successful=models.Count('id', filter=models.Q(response_status__gte=200, response_status__lt=300)),
+            client_errors=models.Count('id', filter=models.Q(response_status__gte=400, response_status__lt=500)),
+            server_errors=models.Count('id', filter=models.Q(response_status__gte=500, response_status__lt=600)),
+        )
+        total = agg['total']
+        successful = agg['successful']
+        client_errors = agg['client_errors']
+        server_errors = agg['server_errors']
 
         return {
             'total_requests': total,
@@ -77,35 +103,152 @@ class RequestLogManager(models.Manager):
             'error_rate': ((client_errors + server_errors) / total * 100) if total > 0 else 0,
         }
 
-    def get_top_paths(self, limit=10):
-        return self.values('path').annotate(
-            count=models.Count('id')
-        ).order_by('-count')[:limit]
-
-    def get_top_ips(self, limit=10):
-        return self.values('remote_ip').annotate(
-            count=models.Count('id')
-        ).order_by('-count')[:limit]
-
-    def get_top_users(self, limit=10):
-        return self.filter(user__isnull=False).values(
-            'user__username', 'user__email'
-        ).annotate(
-            count=models.Count('id')
-        ).order_by('-count')[:limit]
-
-    def get_method_distribution(self):
-        return self.values('http_method').annotate(
-            count=models.Count('id')
-        ).order_by('-count')
-
-    def get_hourly_distribution(self):
-        from django.db import connection
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT strftime('%%H', timestamp) as hour, COUNT(*) as count
-                FROM audit_requestlog
-                GROUP BY strftime('%%H', timestamp)
-                ORDER BY hour
-            """)
-            return [{'hour': row[0], 'count': row[1]} for row in cursor.fetchall()]
+    def _window(self, hours):
+        if hours is None:
+            return self.all()
+        return self.recent(hours=hours)
+
+    def get_top_paths(self, limit=10, hours=24):
+        return cache.get_or_set(
+            f'audit:top_paths:{limit}:{hours}',
+            lambda: list(self._window(hours).values('path').annotate(
+                count=models.Count('id')
+            ).order_by('-count')[:limit]),
+            ANALYTICS_CACHE_TIMEOUT,
+        )
+
+    def get_top_ips(self, limit=10, hours=24):
+        return cache.get_or_set(
+            f'audit:top_ips:{limit}:{hours}',
+            lambda: list(self._window(hours).values('remote_ip').annotate(
+                count=models.Count('id')
+            ).order_by('-count')[:limit]),
+            ANALYTICS_CACHE_TIMEOUT,
+        )
+
+    def get_top_users(self, limit=10, hours=24):
+        return cache.get_or_set(
+            f'audit:top_users:{limit}:{hours}',
+            lambda: list(self._window(hours).filter(user__isnull=False).values(
+                'user__username', 'user__email'
+            ).annotate(
+                count=models.Count('id')
+            ).order_by('-count')[:limit]),
+            ANALYTICS_CACHE_TIMEOUT,
+        )
+
+    def get_method_distribution(self, hours=24):
+        return cache.get_or_set(
+            f'audit:method_distribution:{hours}',
+            lambda: self._count_methods(self._window(hours)),
+            ANALYTICS_CACHE_TIMEOUT,
+        )
+
+    def _count_methods(self, queryset):
+        # http_method only takes the few values in HTTP_METHOD_CHOICES, so one pass of
+        # conditional counts replaces the GROUP BY + sort
+        methods = [method for method, _ in self.model.HTTP_METHOD_CHOICES]
+        row = queryset.aggregate(**{
+            method: models.Count('id', filter=models.Q(http_method=method))
+            for method in methods
+        })
+        distribution = [
+            {'http_method': method, 'count': row[method]}
+            for method in methods if row[method]
+        ]
+        return sorted(distribution, key=lambda item: item['count'], reverse=True)
+
+    def get_distributions(self, limit=10, hours=24):
+        """
+        Top paths and IPs plus the method and hourly distributions, in one pass on PostgreSQL.
+        """
+        if connections[self.db].vendor != 'postgresql':
+            # Each of these is cached on its own already
+            return {
+                'top_paths': self.get_top_paths(limit=limit, hours=hours),
+                'top_ips': self.get_top_ips(limit=limit, hours=hours),
+                'method_distribution': self.get_method_distribution(hours=hours),
+                'hourly_distribution': self.get_hourly_distribution(hours=hours),
+            }
+        return cache.get_or_set(
+            f'audit:distributions:{limit}:{hours}',
+            lambda: self._grouped_distributions(limit, hours),
+            ANALYTICS_CACHE_TIMEOUT,
+        )
+
+    def _grouped_distributions(self, limit, hours):
+        base_sql, params = self._window(hours).annotate(
+            ip=models.Func('remote_ip', function='HOST', output_field=models.CharField()),
+            hour=ExtractHour('timestamp'),
+        ).values('path', 'ip', 'http_method', 'hour').order_by().query.sql_with_params()
+
+        # GROUPING SETS aggregates all four breakdowns from a single scan of the window;
+        # the top-N cut is applied per set by the window function
+        sql = f"""
+            SELECT grp, path, ip, http_method, hour, count FROM (
+                SELECT
+                    GROUPING(path, ip, http_method, hour) AS grp,
+                    path, ip, http_method, hour, COUNT(*) AS count,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY GROUPING(path, ip, http_method, hour) ORDER BY COUNT(*) DESC
+                    ) AS position
+                FROM ({base_sql}) AS base
+                GROUP BY GROUPING SETS ((path), (ip), (http_method), (hour))
+            ) AS grouped
+            WHERE position <= %s OR grp = ANY(%s)
+        """
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, (*params, limit, _UNCUT_GROUPING_SETS))
+            rows = cursor.fetchall()
+
+        distributions = {name: [] for name, _, _ in _GROUPING_SETS.values()}
+        for grp, *columns, count in rows:
+            name, key, position = _GROUPING_SETS[grp]
+            distributions[name].append({key: columns[position], 'count': count})
+        for item in distributions['hourly_distribution']:
+            item['hour'] = int(item['hour'])  # EXTRACT returns numeric
+
+        for name in ('top_paths', 'top_ips', 'method_distribution'):
+            distributions[name].sort(key=lambda item: item['count'], reverse=True)
+        distributions['hourly_distribution'].sort(key=lambda item: item['hour'])
+        return distributions
+
+    def get_hourly_distribution(self, hours=24):
+        return cache.get_or_set(
+            f'audit:hourly_distribution:{hours}',
+            lambda: list(self._window(hours).annotate(
+                hour=ExtractHour('timestamp')
+            ).values('hour').annotate(
+                count=models.Count('id')
+            ).order_by('hour')),
+            ANALYTICS_CACHE_TIMEOUT,
+        )
+
+
+class UserAgentManager(models.Manager):
+    @staticmethod
+    def hash_text(text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def intern(self, text):
+        if not text:
+            return None
+        user_agent, _ = self.get_or_create(
+            ua_hash=self.hash_text(text), defaults={'ua_text': text}
+        )
+        return user_agent
+
+    def intern_many(self, texts):
+        """
+        Return a {text: id} mapping, inserting unseen user agents in one statement.
+        """
+        by_hash = {self.hash_text(text): text for text in texts if text}
+        if not by_hash:
+            return {}
+
+        self.bulk_create(
+            [self.model(ua_hash=ua_hash, ua_text=text) for ua_hash, text in by_hash.items()],
+            ignore_conflicts=True,
+        )
+        ids = dict(self.filter(ua_hash__in=by_hash).values_list('ua_hash', 'id'))
+        return {text: ids.get(ua_hash) for ua_hash, text in by_hash.items()}
@@ -1,11 +1,18 @@
 import time
+import random
+import asyncio
 import logging
+from asgiref.sync import sync_to_async
 from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
-from .models import RequestLog
+from . import async_log
 
 logger = logging.getLogger(__name__)
 
+SAFE_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'TRACE'])
+
+_pending_tasks = set()
+
 
 class RequestLoggingMiddleware(MiddlewareMixin):
     def __init__(self, get_response):
@@ -18,11 +25,31 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         ])
         self.excluded_methods = getattr(settings, 'REQUEST_LOG_EXCLUDED_METHODS', ['OPTIONS'])
         self.log_authenticated_only = getattr(settings, 'REQUEST_LOG_AUTHENTICATED_ONLY', False)
+        self._excluded_prefix_tuple = tuple(self.excluded_paths) + self._asset_prefixes()
+        self._excluded_methods_set = frozenset(self.excluded_methods)
+        self.sample_rates = getattr(settings, 'REQUEST_LOG_SAMPLE_RATE', {})
+        self.buffered = getattr(settings, 'REQUEST_LOG_BUFFERED', False)
+        if self.buffered:
+            async_log.configure(
+                batch_size=getattr(settings, 'REQUEST_LOG_BATCH_SIZE', 500),
+                flush_interval=getattr(settings, 'REQUEST_LOG_FLUSH_INTERVAL', 0.2),
+            )
         super().__init__(get_response)
 
+    @staticmethod
+    def _asset_prefixes():
+        # Follow STATIC_URL/MEDIA_URL so a relocated asset URL stays excluded; CDN URLs never hit us
+        return tuple(
+            url for url in (settings.STATIC_URL, settings.MEDIA_URL)
+            if url and url.startswith('/')
+        )
+
     def process_request(self, request):
-        request._start_time = time.time()
-        request._request_size = self._get_request_size(request)
+        # Excluded requests skip the timing and size bookkeeping entirely
+        request._request_log_excluded = self._is_excluded(request)
+        if not request._request_log_excluded:
+            request._start_time = time.perf_counter_ns()
+            request._request_size = self._get_request_size(request)
         return None
 
     def process_response(self, request, response):
@@ -34,52 +61,85 @@ class RequestLoggingMiddleware(MiddlewareMixin):
 
         return response
 
+    def _is_excluded(self, request):
+        return (
+            request.method in self._excluded_methods_set
+            or request.path.startswith(self._excluded_prefix_tuple)
+        )
+
+    def _request_excluded(self, request):
+        excluded = getattr(request, '_request_log_excluded', None)
+        if excluded is None:
+            excluded = self._is_excluded(request)
+        return excluded
+
     def _should_log_request(self, request):
-        if self.log_authenticated_only and not request.user.is_authenticated:
+        if self._request_excluded(request):
             return False
 
-        if request.method in self.excluded_methods:
+        # Checked last so excluded requests never resolve the lazy request.user
+        if self.log_authenticated_only and not request.user.is_authenticated:
             return False
 
-        for excluded_path in self.excluded_paths:
-            if request.path.startswith(excluded_path):
-                return False
-
         return True
 
+    def _get_sample_rate(self, request, response):
+        if request.method not in SAFE_METHODS and request.user.is_authenticated:
+            return 1.0
+        return self.sample_rates.get(f'{response.status_code // 100}xx', 1.0)
+
     def _log_request(self, request, response):
+        sample_rate = self._get_sample_rate(request, response)
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            return
+
+        data = self._build_log_data(request, response)
+        data['sampled'] = sample_rate < 1.0
+
+        if self.buffered:
+            async_log.enqueue(data)
+        else:
+            RequestLog, UserAgent = async_log.load_models()
+            data['user_agent'] = UserAgent.objects.intern(data['user_agent'])
+            RequestLog.objects.create(**data)
+
+    def _build_log_data(self, request, response):
         start_time = getattr(request, '_start_time', None)
         response_time_ms = None
 
-        if start_time:
-            response_time_ms = int((time.time() - start_time) * 1000)
+        if start_time is not None:
+            # Monotonic, so clock adjustments can't produce negative durations
+            response_time_ms = (time.perf_counter_ns() - start_time) // 1_000_000
 
         request_size = getattr(request, '_request_size', None)
         response_size = self._get_response_size(response)
 
-        RequestLog.objects.create(
-            http_method=request.method,
-            path=request.path[:500],
-            query_string=request.META.get('QUERY_STRING', '')[:1000] or None,
-            remote_ip=self._get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500] or None,
-            user=request.user if request.user.is_authenticated and request.user.pk else None,
-            response_status=response.status_code,
-            response_time_ms=response_time_ms,
-            request_size_bytes=request_size,
-            response_size_bytes=response_size,
-            is_authenticated=request.user.is_authenticated,
-            is_staff=request.user.is_staff if request.user.is_authenticated else False,
-            is_superuser=request.user.is_superuser if request.user.is_authenticated else False,
-        )
+        user = request.user
+        is_authenticated = user.is_authenticated
+        is_staff = is_authenticated and user.is_staff
+        is_superuser = is_authenticated and user.is_superuser
+
+        return {
+            'http_method': request.method,
+            'path': request.path[:500],
+            'query_string': request.META.get('QUERY_STRING', '')[:1000] or None,
+            'remote_ip': self._get_client_ip(request),
+            'user_agent': request.META.get('HTTP_USER_AGENT', '')[:500] or None,
+            'user': user if is_authenticated and user.pk else None,
+            'response_status': response.status_code,
+            'response_time_ms': response_time_ms,
+            'request_size_bytes': request_size,
+            'response_size_bytes': response_size,
+            'is_authenticated': is_authenticated,
+            'is_staff': is_staff,
+            'is_superuser': is_superuser,
+        }
 
     def _get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+            return x_forwarded_for.partition(',')[0].strip()
+        return request.META.get('REMOTE_ADDR')
 
     def _get_request_size(self, request):
         try:
@@ -87,33 +147,49 @@ class RequestLoggingMiddleware(MiddlewareMixin):
             if content_length:
                 return int(content_length)
 
-            if hasattr(request, 'body'):
-                return len(request.body)
-
+            # Reading request.body here would buffer the whole upload before the view runs
             return None
         except (ValueError, TypeError):
             return None
 
     def _get_response_size(self, response):
-        try:
-            if hasattr(response, 'content'):
-                return len(response.content)
+        # Never touch .content on streaming responses, it would consume the iterator
+        if getattr(response, 'streaming', False):
             return None
+
+        try:
+            content_length = response.get('Content-Length') if hasattr(response, 'get') else None
+            if content_length is not None:
+                return int(content_length)
+
+            content = getattr(response, 'content', None)
+            return len(content) if content is not None else None
         except (ValueError, TypeError):
             return None
 
 
 class RequestLoggingMiddlewareAsync(RequestLoggingMiddleware):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self._alog_request = sync_to_async(self._safe_log_request, thread_sensitive=False)
+
     async def __call__(self, request):
-        request._start_time = time.time()
-        request._request_size = self._get_request_size(request)
+        self.process_request(request)
 
         response = await self.get_response(request)
 
-        if self._should_log_request(request):
-            try:
-                self._log_request(request, response)
-            except Exception as e:
-                logger.error(f"Failed to log request: {e}")
+        # Only the path/method checks run on the loop; anything that touches request.user
+        # (authenticated-only filtering, sampling) happens in the worker thread
+        if not self._request_excluded(request):
+            task = asyncio.ensure_future(self._alog_request(request, response))
+            _pending_tasks.add(task)
+            task.add_done_callback(_pending_tasks.discard)
 
         return response
+
+    def _safe_log_request(self, request, response):
+        try:
+            if self._should_log_request(request):
+                self._log_request(request, response)
+        except Exception as e:
+            logger.error(f"Failed to log request: {e}")
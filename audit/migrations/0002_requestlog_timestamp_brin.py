@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_brin_index(apps, schema_editor):
+    # BRIN is PostgreSQL-only; other backends keep the B-tree on timestamp
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS rl_ts_brin ON audit_requestlog USING brin ("timestamp")'
+    )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS rl_ts_brin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_index, drop_brin_index),
+    ]
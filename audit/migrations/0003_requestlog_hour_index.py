@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:30
+
+import django.db.models.functions.datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_requestlog_timestamp_brin'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(django.db.models.functions.datetime.ExtractHour('timestamp'), name='rl_hour_idx'),
+        ),
+    ]
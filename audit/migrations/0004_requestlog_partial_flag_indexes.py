@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_requestlog_hour_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='requestlog',
+            name='is_authenticated',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='requestlog',
+            name='is_staff',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='requestlog',
+            name='is_superuser',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(condition=models.Q(('is_staff', True)), fields=['timestamp'], name='rl_staff_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(condition=models.Q(('is_superuser', True)), fields=['timestamp'], name='rl_super_ts'),
+        ),
+    ]
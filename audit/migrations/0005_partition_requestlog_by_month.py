@@ -0,0 +1,84 @@
+from datetime import date
+
+from django.db import migrations
+from django.db.migrations.exceptions import IrreversibleError
+
+
+def _add_months(day, months):
+    month_index = day.month - 1 + months
+    return date(day.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_requestlog(apps, schema_editor):
+    # Declarative partitioning is PostgreSQL-only; other backends keep a plain table
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes "
+            "WHERE tablename = 'audit_requestlog' AND indexname <> 'audit_requestlog_pkey'"
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = 'audit_requestlog'::regclass AND contype = 'f'"
+        )
+        foreign_keys = cursor.fetchall()
+
+        cursor.execute("SELECT MIN(timestamp) FROM audit_requestlog")
+        oldest = cursor.fetchone()[0]
+
+    schema_editor.execute("ALTER TABLE audit_requestlog RENAME TO audit_requestlog_old")
+    schema_editor.execute(
+        "CREATE TABLE audit_requestlog ("
+        "LIKE audit_requestlog_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING IDENTITY"
+        ") PARTITION BY RANGE (\"timestamp\")"
+    )
+    # The partition key must be part of every unique constraint
+    schema_editor.execute('ALTER TABLE audit_requestlog ADD PRIMARY KEY (id, "timestamp")')
+
+    today = date.today()
+    month = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+    last_month = _add_months(today, 2)
+    while month <= last_month:
+        next_month = _add_months(month, 1)
+        schema_editor.execute(
+            f"CREATE TABLE audit_requestlog_p{month:%Y%m} PARTITION OF audit_requestlog "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    schema_editor.execute("CREATE TABLE audit_requestlog_default PARTITION OF audit_requestlog DEFAULT")
+
+    schema_editor.execute("INSERT INTO audit_requestlog SELECT * FROM audit_requestlog_old")
+    schema_editor.execute("DROP TABLE audit_requestlog_old")
+
+    for name, definition in foreign_keys:
+        schema_editor.execute(f"ALTER TABLE audit_requestlog ADD CONSTRAINT {name} {definition}")
+    for definition in index_definitions:
+        schema_editor.execute(definition)
+
+    schema_editor.execute(
+        "SELECT setval(pg_get_serial_sequence('audit_requestlog', 'id'), "
+        "COALESCE((SELECT MAX(id) FROM audit_requestlog), 0) + 1, false)"
+    )
+
+
+def unpartition_requestlog(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    raise IrreversibleError(
+        'Converting audit_requestlog back to a regular table is not supported'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0004_requestlog_partial_flag_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_requestlog, unpartition_requestlog),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:34
+
+from django.db import migrations, models
+
+
+def create_path_trigram_index(apps, schema_editor):
+    # Trigram GIN indexes are PostgreSQL-only and need the pg_trgm contrib module
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS rl_path_trgm ON audit_requestlog USING gin (path gin_trgm_ops)'
+    )
+
+
+def drop_path_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS rl_path_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0005_partition_requestlog_by_month'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='requestlog',
+            name='audit_reque_path_260cdb_idx',
+        ),
+        migrations.AlterField(
+            model_name='requestlog',
+            name='remote_ip',
+            field=models.GenericIPAddressField(blank=True, null=True),
+        ),
+        migrations.RunPython(create_path_trigram_index, drop_path_trigram_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0006_requestlog_path_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestlog',
+            name='sampled',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,91 @@
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def intern_user_agents(apps, schema_editor):
+    RequestLog = apps.get_model('audit', 'RequestLog')
+    UserAgent = apps.get_model('audit', 'UserAgent')
+
+    if schema_editor.connection.vendor == 'postgresql':
+        # One set-based insert and one joined update, instead of a table scan per distinct agent
+        schema_editor.execute(
+            "INSERT INTO audit_useragent (ua_hash, ua_text) "
+            "SELECT DISTINCT encode(sha256(convert_to(user_agent, 'UTF8')), 'hex'), user_agent "
+            "FROM audit_requestlog WHERE user_agent IS NOT NULL AND user_agent <> '' "
+            "ON CONFLICT (ua_hash) DO NOTHING"
+        )
+        schema_editor.execute(
+            "UPDATE audit_requestlog AS r SET user_agent_ref_id = u.id "
+            "FROM audit_useragent AS u WHERE u.ua_text = r.user_agent"
+        )
+        # The new FK is DEFERRABLE INITIALLY DEFERRED; fire its queued checks now, or the
+        # ALTER TABLEs below fail with "pending trigger events"
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        return
+
+    texts = (
+        RequestLog.objects.exclude(user_agent__isnull=True)
+        .exclude(user_agent='')
+        .values_list('user_agent', flat=True)
+        .distinct()
+    )
+    UserAgent.objects.bulk_create(
+        [
+            UserAgent(ua_hash=hashlib.sha256(text.encode('utf-8')).hexdigest(), ua_text=text)
+            for text in texts.iterator()
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    RequestLog.objects.exclude(user_agent__isnull=True).exclude(user_agent='').update(
+        user_agent_ref=Subquery(UserAgent.objects.filter(ua_text=OuterRef('user_agent')).values('pk')[:1])
+    )
+
+
+def restore_user_agents(apps, schema_editor):
+    RequestLog = apps.get_model('audit', 'RequestLog')
+    UserAgent = apps.get_model('audit', 'UserAgent')
+
+    RequestLog.objects.filter(user_agent_ref__isnull=False).update(
+        user_agent=Subquery(UserAgent.objects.filter(pk=OuterRef('user_agent_ref')).values('ua_text')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0007_requestlog_sampled'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAgent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ua_hash', models.CharField(max_length=64, unique=True)),
+                ('ua_text', models.TextField()),
+            ],
+            options={
+                'verbose_name': 'User Agent',
+                'verbose_name_plural': 'User Agents',
+            },
+        ),
+        migrations.AddField(
+            model_name='requestlog',
+            name='user_agent_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='audit.useragent'),
+        ),
+        migrations.RunPython(intern_user_agents, restore_user_agents),
+        migrations.RemoveField(
+            model_name='requestlog',
+            name='user_agent',
+        ),
+        migrations.RenameField(
+            model_name='requestlog',
+            old_name='user_agent_ref',
+            new_name='user_agent',
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0008_intern_requestlog_user_agent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['http_method', 'response_status'], name='audit_reque_http_me_f81d6c_idx'),
+        ),
+    ]
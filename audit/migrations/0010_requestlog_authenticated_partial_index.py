@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0009_requestlog_method_status_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(condition=models.Q(('is_authenticated', True)), fields=['timestamp'], name='rl_auth_ts'),
+        ),
+    ]
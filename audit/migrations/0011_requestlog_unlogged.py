@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def _set_persistence(connection, persistence):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = 'audit_requestlog'"
+        )
+        # A partitioned parent has no storage of its own, so persistence is set per partition
+        tables = [row[0] for row in cursor.fetchall()] or ['audit_requestlog']
+        for table in tables:
+            cursor.execute(f'ALTER TABLE {table} SET {persistence}')
+
+
+def make_unlogged(apps, schema_editor):
+    # UNLOGGED storage is PostgreSQL-only and opt-in through REQUEST_LOG_UNLOGGED
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    if not getattr(settings, 'REQUEST_LOG_UNLOGGED', False):
+        return
+    _set_persistence(schema_editor.connection, 'UNLOGGED')
+
+
+def make_logged(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    _set_persistence(schema_editor.connection, 'LOGGED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0010_requestlog_authenticated_partial_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(make_unlogged, make_logged),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+def _has_pg_trgm(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def index_upper_path(apps, schema_editor):
+    # Django compiles icontains to UPPER(path::text) LIKE UPPER(%s) on PostgreSQL, which a
+    # trigram index on the bare column can't serve; index the same expression instead
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    if not _has_pg_trgm(schema_editor.connection):
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute('DROP INDEX IF EXISTS rl_path_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS rl_path_upper_trgm '
+        'ON audit_requestlog USING gin (UPPER(path::text) gin_trgm_ops)'
+    )
+
+
+def index_bare_path(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS rl_path_upper_trgm')
+    if not _has_pg_trgm(schema_editor.connection):
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS rl_path_trgm ON audit_requestlog USING gin (path gin_trgm_ops)'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0011_requestlog_unlogged'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_upper_path, index_bare_path),
+    ]
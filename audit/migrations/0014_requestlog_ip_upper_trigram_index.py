@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+def _has_pg_trgm(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def index_upper_ip(apps, schema_editor):
+    # remote_ip icontains compiles to UPPER(HOST(remote_ip)) LIKE UPPER(%s) on PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    if not _has_pg_trgm(schema_editor.connection):
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS rl_ip_upper_trgm '
+        'ON audit_requestlog USING gin (UPPER(HOST(remote_ip)) gin_trgm_ops)'
+    )
+
+
+def drop_upper_ip_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS rl_ip_upper_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0013_requestlog_timestamp_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_upper_ip, drop_upper_ip_index),
+    ]
@@ -1,28 +1,41 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.db.models.functions import ExtractHour
 from django.core.validators import MinLengthValidator
-from .managers import RequestLogManager
+from .constants import HTTP_METHOD_CHOICES
+from .managers import RequestLogManager, UserAgentManager
+
+
+class UserAgent(models.Model):
+    ua_hash = models.CharField(max_length=64, unique=True)
+    ua_text = models.TextField()
+
+    objects = UserAgentManager()
+
+    class Meta:
+        verbose_name = "User Agent"
+        verbose_name_plural = "User Agents"
+
+    def __str__(self):
+        return self.ua_text
 
 
 class RequestLog(models.Model):
-    HTTP_METHOD_CHOICES = [
-        ('GET', 'GET'),
-        ('POST', 'POST'),
-        ('PUT', 'PUT'),
-        ('PATCH', 'PATCH'),
-        ('DELETE', 'DELETE'),
-        ('HEAD', 'HEAD'),
-        ('OPTIONS', 'OPTIONS'),
-        ('TRACE', 'TRACE'),
-    ]
-
-    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+    HTTP_METHOD_CHOICES = HTTP_METHOD_CHOICES
+
+    timestamp = models.DateTimeField(default=timezone.now)
     http_method = models.CharField(max_length=10, choices=HTTP_METHOD_CHOICES, db_index=True)
     path = models.CharField(max_length=500, validators=[MinLengthValidator(1)])
     query_string = models.TextField(blank=True, null=True)
-    remote_ip = models.GenericIPAddressField(null=True, blank=True, db_index=True)
-    user_agent = models.TextField(blank=True, null=True)
+    remote_ip = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.ForeignKey(
+        UserAgent,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
     user = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -34,9 +47,10 @@ class RequestLog(models.Model):
     response_time_ms = models.PositiveIntegerField(null=True, blank=True)
     request_size_bytes = models.PositiveIntegerField(null=True, blank=True)
     response_size_bytes = models.PositiveIntegerField(null=True, blank=True)
-    is_authenticated = models.BooleanField(default=False, db_index=True)
-    is_staff = models.BooleanField(default=False, db_index=True)
-    is_superuser = models.BooleanField(default=False, db_index=True)
+    is_authenticated = models.BooleanField(default=False)
+    is_staff = models.BooleanField(default=False)
+    is_superuser = models.BooleanField(default=False)
+    sampled = models.BooleanField(default=False)
 
     objects = RequestLogManager()
 
@@ -45,11 +59,17 @@ class RequestLog(models.Model):
         verbose_name_plural = "Request Logs"
         ordering = ['-timestamp']
         indexes = [
+            # Also serves plain timestamp ranges; the id tiebreaker backs keyset pagination
+            models.Index(fields=['timestamp', 'id'], name='rl_ts_id'),
             models.Index(fields=['timestamp', 'http_method']),
+            models.Index(fields=['http_method', 'response_status']),
             models.Index(fields=['user', 'timestamp']),
             models.Index(fields=['remote_ip', 'timestamp']),
             models.Index(fields=['response_status', 'timestamp']),
-            models.Index(fields=['path', 'timestamp']),
+            models.Index(ExtractHour('timestamp'), name='rl_hour_idx'),
+            models.Index(fields=['timestamp'], condition=models.Q(is_authenticated=True), name='rl_auth_ts'),
+            models.Index(fields=['timestamp'], condition=models.Q(is_staff=True), name='rl_staff_ts'),
+            models.Index(fields=['timestamp'], condition=models.Q(is_superuser=True), name='rl_super_ts'),
         ]
 
     def __str__(self):
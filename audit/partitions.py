@@ -0,0 +1,106 @@
+from datetime import date
+
+from django.db import transaction
+
+PARENT_TABLE = 'audit_requestlog'
+DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    month_index = day.month - 1 + months
+    return date(day.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{PARENT_TABLE}_p{month:%Y%m}'
+
+
+def create_monthly_partition(cursor, month, unlogged=False):
+    """
+    Create the RANGE partition holding one calendar month of request logs.
+
+    Rows for that month that already landed in the default partition are moved into the new
+    one; PostgreSQL refuses to add a partition whose range overlaps rows held by the default.
+    """
+    start = month_start(month)
+    end = add_months(start, 1)
+    name = partition_name(start)
+    cursor.execute('SELECT to_regclass(%s)', [name])
+    if cursor.fetchone()[0] is not None:
+        return name
+
+    persistence = 'UNLOGGED ' if unlogged else ''
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    # The detach holds an exclusive lock on the parent, so writers wait instead of failing
+    with transaction.atomic(using=cursor.db.alias):
+        has_default = _has_default_partition(cursor)
+        if has_default:
+            cursor.execute(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}')
+        cursor.execute(f'CREATE {persistence}TABLE {name} PARTITION OF {PARENT_TABLE} {bounds}')
+        if has_default:
+            cursor.execute(
+                f'WITH moved AS ('
+                f'DELETE FROM {DEFAULT_PARTITION} WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *'
+                f') INSERT INTO {name} SELECT * FROM moved',
+                [start, end],
+            )
+            cursor.execute(f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT')
+    return name
+
+
+def _has_default_partition(cursor):
+    cursor.execute(
+        "SELECT 1 FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s AND c.relname = %s",
+        [PARENT_TABLE, DEFAULT_PARTITION],
+    )
+    return cursor.fetchone() is not None
+
+
+def is_partitioned(connection):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def monthly_partitions(cursor):
+    """
+    Map the start month of every monthly partition to its table name.
+    """
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s",
+        [PARENT_TABLE],
+    )
+    prefix = f'{PARENT_TABLE}_p'
+    partitions = {}
+    for (name,) in cursor.fetchall():
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and len(suffix) == 6 and suffix.isdigit():
+            partitions[date(int(suffix[:4]), int(suffix[4:]), 1)] = name
+    return partitions
+
+
+def drop_partitions_before(cursor, cutoff):
+    """
+    Drop every monthly partition whose whole range ends on or before cutoff.
+    """
+    dropped = []
+    for start, name in sorted(monthly_partitions(cursor).items()):
+        if add_months(start, 1) <= cutoff:
+            cursor.execute(f'DROP TABLE IF EXISTS {name}')
+            dropped.append(name)
+    return dropped
+
@@ -0,0 +1,37 @@
+from rest_framework import serializers
+
+
+class RequestLogSerializer(serializers.Serializer):
+    """
+    Read-only representation of a RequestLog.values(*API_FIELDS) row.
+    """
+    id = serializers.IntegerField()
+    timestamp = serializers.DateTimeField()
+    http_method = serializers.CharField()
+    path = serializers.CharField()
+    query_string = serializers.CharField()
+    remote_ip = serializers.CharField()
+    user_agent = serializers.CharField(source='user_agent__ua_text')
+    user = serializers.SerializerMethodField()
+    response_status = serializers.IntegerField()
+    response_time_ms = serializers.IntegerField()
+    request_size_bytes = serializers.IntegerField()
+    response_size_bytes = serializers.IntegerField()
+    is_authenticated = serializers.BooleanField()
+    is_staff = serializers.BooleanField()
+    is_superuser = serializers.BooleanField()
+
+    def get_user(self, row):
+        if row['user__username'] is None:
+            return None
+        return {'username': row['user__username'], 'email': row['user__email']}
+
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        # Same definitions as the RequestLog properties, from a single read of the status class
+        status = row['response_status']
+        status_class = status // 100 if status else None
+        data['is_successful'] = status and status_class == 2
+        data['is_client_error'] = status and status_class == 4
+        data['is_server_error'] = status and status_class == 5
+        return data
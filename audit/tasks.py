@@ -0,0 +1,8 @@
+from celery import shared_task
+from django.core.management import call_command
+
+
+@shared_task
+def create_request_log_partitions(months=3):
+    # Scheduled by Celery beat so upcoming months always have a partition before rows arrive
+    call_command('create_request_log_partitions', months=months)
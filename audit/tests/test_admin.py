@@ -0,0 +1,99 @@
+from django.contrib import admin
+from django.test import TestCase, Client, RequestFactory
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from ..admin import RequestLogAdmin, EstimatedCountPaginator, ResponseStatusFilter
+from ..models import RequestLog, UserAgent
+
+
+class RequestLogAdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+
+        RequestLog.objects.create(
+            http_method='GET',
+            path='/test/path/',
+            remote_ip='127.0.0.1',
+            user=cls.superuser,
+            response_status=200,
+            response_time_ms=100,
+            is_authenticated=True
+        )
+
+        RequestLog.objects.create(
+            http_method='POST',
+            path='/api/cvs/',
+            remote_ip='192.168.1.1',
+            response_status=404,
+            response_time_ms=2500,
+            is_authenticated=False
+        )
+
+    def setUp(self):
+        self.client = Client()
+
+        self.client.login(username='admin', password='testpass123')
+
+    def test_changelist_renders(self):
+        response = self.client.get(reverse('admin:audit_requestlog_changelist'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '/test/path/')
+        self.assertContains(response, '/api/cvs/')
+        self.assertContains(response, 'admin')
+
+    def test_changelist_response_status_filter(self):
+        response = self.client.get(
+            reverse('admin:audit_requestlog_changelist'), {'response_status': '404'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '/api/cvs/')
+        self.assertNotContains(response, '/test/path/')
+
+    def test_display_methods_escape_values(self):
+        model_admin = RequestLogAdmin(RequestLog, admin.site)
+        log = RequestLog(
+            path='/<script>/' + 'x' * 60,
+            response_status=503,
+            response_time_ms=1500,
+            user_agent=UserAgent(ua_text='<b>agent</b>'),
+        )
+
+        self.assertNotIn('<script>', model_admin.path_display(log))
+        self.assertIn('&lt;script&gt;', model_admin.path_display(log))
+        self.assertIn('color: red', model_admin.response_status_display(log))
+        self.assertIn('>503<', model_admin.response_status_display(log))
+        self.assertIn('1500ms', model_admin.response_time_display(log))
+        self.assertIn('&lt;b&gt;agent&lt;/b&gt;', model_admin.user_agent_display(log))
+
+    def test_user_display_links_to_user_change_page(self):
+        model_admin = RequestLogAdmin(RequestLog, admin.site)
+        log = RequestLog.objects.filter(user__isnull=False).get()
+
+        self.assertIn(
+            reverse('admin:auth_user_change', args=[self.superuser.pk]),
+            model_admin.user_display(log)
+        )
+
+    def test_estimated_count_paginator_counts_exactly_on_small_tables(self):
+        paginator = EstimatedCountPaginator(RequestLog.objects.order_by('-timestamp'), 50)
+
+        self.assertEqual(paginator.count, 2)
+
+
+class ResponseStatusFilterTestCase(TestCase):
+    def test_options_skip_distinct_scan(self):
+        model_admin = RequestLogAdmin(RequestLog, admin.site)
+
+        with self.assertNumQueries(0):
+            status_filter = ResponseStatusFilter(RequestFactory().get('/'), {}, RequestLog, model_admin)
+
+        self.assertIn((404, 404), status_filter.lookup_choices)
+        self.assertIn((503, 503), status_filter.lookup_choices)
@@ -0,0 +1,69 @@
+from io import StringIO
+from datetime import datetime, timedelta
+from unittest import skipUnless
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import RequestLog
+from ..partitions import DEFAULT_PARTITION, add_months, create_monthly_partition, month_start, monthly_partitions
+from ..tasks import create_request_log_partitions
+
+
+class PruneRequestLogsCommandTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for days in (1, 29, 31, 90):
+            RequestLog.objects.create(
+                http_method='GET',
+                path=f'/{days}/',
+                timestamp=now - timedelta(days=days)
+            )
+
+    def test_deletes_logs_past_retention(self):
+        out = StringIO()
+        call_command('prune_request_logs', stdout=out)
+
+        self.assertEqual(
+            set(RequestLog.objects.values_list('path', flat=True)), {'/1/', '/29/'}
+        )
+        self.assertIn('Deleted 2 request logs', out.getvalue())
+
+    def test_days_option(self):
+        call_command('prune_request_logs', days=7, stdout=StringIO())
+
+        self.assertEqual(list(RequestLog.objects.values_list('path', flat=True)), ['/1/'])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Request log partitioning is PostgreSQL-only')
+class CreateRequestLogPartitionsTestCase(TestCase):
+    def test_moves_rows_out_of_the_default_partition(self):
+        # Far enough ahead that the migration's pre-created partitions don't cover it
+        month = add_months(month_start(timezone.now().date()), 12)
+        RequestLog.objects.create(http_method='GET', path='/future/', timestamp=timezone.now() + timedelta(days=400))
+        log = RequestLog.objects.create(
+            http_method='GET', path='/early/', timestamp=timezone.make_aware(datetime(month.year, month.month, 2))
+        )
+
+        with connection.cursor() as cursor:
+            name = create_monthly_partition(cursor, month)
+            self.assertEqual(create_monthly_partition(cursor, month), name)
+
+            cursor.execute(f'SELECT path FROM {name}')
+            self.assertEqual(cursor.fetchall(), [('/early/',)])
+            cursor.execute(f'SELECT path FROM {DEFAULT_PARTITION}')
+            self.assertNotIn(('/early/',), cursor.fetchall())
+
+        # The default partition is attached again and still takes out-of-range rows
+        self.assertEqual(RequestLog.objects.get(pk=log.pk).path, '/early/')
+        RequestLog.objects.create(http_method='GET', path='/later/', timestamp=timezone.now() + timedelta(days=800))
+
+    def test_scheduled_task_creates_upcoming_partitions(self):
+        create_request_log_partitions(months=2)
+
+        with connection.cursor() as cursor:
+            partitions = monthly_partitions(cursor)
+        current = month_start(timezone.now().date())
+        self.assertIn(current, partitions)
+        self.assertIn(add_months(current, 1), partitions)
@@ -0,0 +1,151 @@
+from unittest import skipUnless
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.core.cache import cache
+from django.utils import timezone
+from datetime import timedelta
+
+from ..models import RequestLog
+
+
+class RequestLogStatsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        for status_code in (200, 201, 302, 404, 500):
+            RequestLog.objects.create(
+                http_method='GET',
+                path='/test/path/',
+                remote_ip='127.0.0.1',
+                response_status=status_code,
+            )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_get_stats_single_query(self):
+        with self.assertNumQueries(1):
+            stats = RequestLog.objects.get_stats()
+
+        self.assertEqual(stats['total_requests'], 5)
+        self.assertEqual(stats['successful_requests'], 2)
+        self.assertEqual(stats['client_errors'], 1)
+        self.assertEqual(stats['server_errors'], 1)
+        self.assertEqual(stats['success_rate'], 40.0)
+        self.assertEqual(stats['error_rate'], 40.0)
+
+    def test_get_stats_reads_current_counts(self):
+        RequestLog.objects.get_stats()
+        RequestLog.objects.create(http_method='GET', path='/new/', response_status=200)
+
+        # Caching is left to the call sites, so the manager always aggregates what it is given
+        self.assertEqual(RequestLog.objects.get_stats()['total_requests'], 6)
+
+    def test_get_stats_empty_table(self):
+        RequestLog.objects.all().delete()
+
+        stats = RequestLog.objects.get_stats()
+
+        self.assertEqual(stats['total_requests'], 0)
+        self.assertEqual(stats['success_rate'], 0)
+        self.assertEqual(stats['error_rate'], 0)
+
+
+class RequestLogTopAggregatesTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        for path in ('/a/', '/a/', '/b/'):
+            RequestLog.objects.create(http_method='GET', path=path, remote_ip='127.0.0.1')
+
+        RequestLog.objects.create(
+            http_method='POST',
+            path='/old/',
+            remote_ip='10.0.0.1',
+            timestamp=timezone.now() - timedelta(days=3)
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_get_top_paths_uses_recent_window(self):
+        top_paths = RequestLog.objects.get_top_paths()
+
+        self.assertEqual([p['path'] for p in top_paths], ['/a/', '/b/'])
+        self.assertEqual(top_paths[0]['count'], 2)
+
+    def test_get_top_paths_full_history(self):
+        top_paths = RequestLog.objects.get_top_paths(hours=None)
+
+        self.assertIn('/old/', [p['path'] for p in top_paths])
+
+    def test_top_aggregates_limit_in_sql(self):
+        with CaptureQueriesContext(connection) as ctx:
+            top_paths = RequestLog.objects.get_top_paths(limit=1)
+            top_ips = RequestLog.objects.get_top_ips(limit=1)
+
+        self.assertEqual(top_paths, [{'path': '/a/', 'count': 2}])
+        self.assertEqual(top_ips, [{'remote_ip': '127.0.0.1', 'count': 3}])
+        self.assertTrue(all('LIMIT 1' in q['sql'] for q in ctx.captured_queries))
+
+    def test_get_method_distribution_uses_recent_window(self):
+        method_dist = RequestLog.objects.get_method_distribution()
+
+        self.assertEqual(method_dist, [{'http_method': 'GET', 'count': 3}])
+
+    def test_get_method_distribution_single_query(self):
+        RequestLog.objects.create(http_method='DELETE', path='/a/')
+        RequestLog.objects.create(http_method='DELETE', path='/a/')
+        RequestLog.objects.create(http_method='PUT', path='/a/')
+
+        with self.assertNumQueries(1):
+            method_dist = RequestLog.objects.get_method_distribution()
+
+        self.assertEqual(method_dist, [
+            {'http_method': 'GET', 'count': 3},
+            {'http_method': 'DELETE', 'count': 2},
+            {'http_method': 'PUT', 'count': 1},
+        ])
+
+    def test_get_distributions_matches_individual_aggregates(self):
+        distributions = RequestLog.objects.get_distributions(limit=1)
+
+        self.assertEqual(distributions['top_paths'], [{'path': '/a/', 'count': 2}])
+        self.assertEqual(distributions['top_ips'], [{'remote_ip': '127.0.0.1', 'count': 3}])
+        self.assertEqual(distributions['method_distribution'], [{'http_method': 'GET', 'count': 3}])
+        self.assertEqual(sum(h['count'] for h in distributions['hourly_distribution']), 3)
+
+    @skipUnless(connection.vendor == 'postgresql', 'GROUPING SETS path is PostgreSQL-only')
+    def test_get_distributions_single_query_on_postgresql(self):
+        with self.assertNumQueries(1):
+            RequestLog.objects.get_distributions(limit=1)
+
+    def test_get_distributions_keeps_every_method_past_the_limit(self):
+        RequestLog.objects.create(http_method='PUT', path='/a/')
+
+        distributions = RequestLog.objects.get_distributions(limit=1)
+
+        self.assertEqual(len(distributions['top_paths']), 1)
+        self.assertEqual(distributions['method_distribution'], [
+            {'http_method': 'GET', 'count': 3},
+            {'http_method': 'PUT', 'count': 1},
+        ])
+
+
+class RequestLogHourlyDistributionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_get_hourly_distribution(self):
+        now = timezone.now().replace(minute=30)
+        RequestLog.objects.create(http_method='GET', path='/a/', timestamp=now)
+        RequestLog.objects.create(http_method='GET', path='/b/', timestamp=now)
+        RequestLog.objects.create(http_method='GET', path='/old/', timestamp=now - timedelta(days=3))
+
+        hourly = RequestLog.objects.get_hourly_distribution()
+
+        self.assertEqual(hourly, [{'hour': now.hour, 'count': 2}])
@@ -0,0 +1,384 @@
+import asyncio
+import threading
+from django.test import TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth.models import User, AnonymousUser
+from django.http import HttpResponse, StreamingHttpResponse
+from unittest.mock import patch
+
+from .. import async_log
+from ..models import RequestLog, UserAgent
+from ..middleware import RequestLoggingMiddleware, RequestLoggingMiddlewareAsync, _pending_tasks
+
+
+@override_settings(REQUEST_LOG_BUFFERED=True)
+class BufferedRequestLoggingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        writer_patcher = patch('audit.async_log.start_writer')
+        self.start_writer = writer_patcher.start()
+        self.addCleanup(writer_patcher.stop)
+
+        self.middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+
+    def tearDown(self):
+        async_log.flush()
+
+    def test_request_is_queued_not_written(self):
+        request = self.factory.get('/test/path/')
+        request.user = self.user
+
+        response = self.middleware(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(RequestLog.objects.count(), 0)
+        self.assertEqual(async_log.pending_count(), 1)
+        self.start_writer.assert_called_once()
+
+    def test_flush_writes_queued_logs_in_bulk(self):
+        for i in range(3):
+            request = self.factory.get(f'/test/path/{i}/')
+            request.user = self.user
+            self.middleware(request)
+
+        with CaptureQueriesContext(connection) as ctx:
+            async_log.flush()
+
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+
+        self.assertEqual(RequestLog.objects.count(), 3)
+        self.assertEqual(async_log.pending_count(), 0)
+        self.assertEqual(
+            set(RequestLog.objects.values_list('path', flat=True)),
+            {'/test/path/0/', '/test/path/1/', '/test/path/2/'}
+        )
+
+    def test_full_buffer_drops_oldest_logs(self):
+        with patch.object(async_log, 'MAX_PENDING', 2), \
+                patch.object(async_log, '_pending', async_log.deque(maxlen=2)):
+            for i in range(3):
+                request = self.factory.get(f'/test/path/{i}/')
+                request.user = self.user
+                self.middleware(request)
+
+            async_log.flush()
+
+        self.assertEqual(
+            set(RequestLog.objects.values_list('path', flat=True)),
+            {'/test/path/1/', '/test/path/2/'}
+        )
+
+
+class ResponseSizeTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _log_for(self, response):
+        middleware = RequestLoggingMiddleware(lambda r: response)
+        request = self.factory.get('/test/path/')
+        request.user = self.user
+        middleware(request)
+        return RequestLog.objects.get()
+
+    def test_streaming_response_is_not_consumed(self):
+        response = StreamingHttpResponse(iter([b'chunk1', b'chunk2']))
+
+        log = self._log_for(response)
+
+        self.assertIsNone(log.response_size_bytes)
+        self.assertEqual(b''.join(response.streaming_content), b'chunk1chunk2')
+
+    def test_content_length_header_is_preferred(self):
+        response = HttpResponse('body')
+        response['Content-Length'] = '1234'
+
+        log = self._log_for(response)
+
+        self.assertEqual(log.response_size_bytes, 1234)
+
+    def test_falls_back_to_content_length(self):
+        log = self._log_for(HttpResponse('Test response'))
+
+        self.assertEqual(log.response_size_bytes, len('Test response'))
+
+
+class ResponseTimeTestCase(TestCase):
+    def test_response_time_uses_monotonic_counter(self):
+        middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+        request = RequestFactory().get('/test/path/')
+        request.user = User.objects.create_user(username='testuser', password='testpass123')
+
+        with patch('audit.middleware.time.perf_counter_ns', side_effect=[1_000_000_000, 1_250_900_000]):
+            middleware(request)
+
+        self.assertEqual(RequestLog.objects.get().response_time_ms, 250)
+
+
+class ClientIPTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+
+    def test_uses_first_forwarded_hop(self):
+        request = self.factory.get('/', HTTP_X_FORWARDED_FOR=' 203.0.113.7 , 10.0.0.1, 10.0.0.2')
+
+        self.assertEqual(self.middleware._get_client_ip(request), '203.0.113.7')
+
+    def test_falls_back_to_remote_addr(self):
+        request = self.factory.get('/', REMOTE_ADDR='198.51.100.4')
+
+        self.assertEqual(self.middleware._get_client_ip(request), '198.51.100.4')
+
+
+class LoggingFailureTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = AnonymousUser()
+
+    def test_write_errors_are_logged_without_traceback(self):
+        middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+        request = self.factory.get('/test/path/')
+        request.user = self.user
+
+        with patch('audit.models.RequestLog.objects.create', side_effect=Exception("Database error")), \
+                self.assertLogs('audit.middleware', level='ERROR') as logs:
+            response = middleware(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(logs.records[0].exc_info)
+
+    def test_view_errors_are_not_swallowed(self):
+        def get_response(request):
+            raise ValueError("view failed")
+
+        middleware = RequestLoggingMiddleware(get_response)
+        request = self.factory.get('/test/path/')
+        request.user = self.user
+
+        with self.assertRaises(ValueError):
+            middleware(request)
+
+
+class RequestSizeTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+
+    def test_uses_content_length_header(self):
+        request = self.factory.post('/test/path/', data='x' * 10, content_type='text/plain')
+
+        self.assertEqual(self.middleware._get_request_size(request), 10)
+
+    def test_does_not_read_body_without_content_length(self):
+        request = self.factory.post('/test/path/', data='x' * 10, content_type='text/plain')
+        del request.META['CONTENT_LENGTH']
+
+        self.assertIsNone(self.middleware._get_request_size(request))
+        self.assertFalse(hasattr(request, '_body'))
+
+
+class ExcludedRequestTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    @override_settings(REQUEST_LOG_AUTHENTICATED_ONLY=True)
+    def test_excluded_path_skips_bookkeeping(self):
+        middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+        # No request.user: resolving it for an excluded path would raise AttributeError
+        request = self.factory.get('/static/css/site.css')
+
+        middleware(request)
+
+        self.assertFalse(hasattr(request, '_start_time'))
+        self.assertEqual(RequestLog.objects.count(), 0)
+
+    @override_settings(STATIC_URL='/assets/', MEDIA_URL='https://cdn.example.com/media/')
+    def test_static_url_is_excluded(self):
+        middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+        request = self.factory.get('/assets/js/app.js')
+        request.user = User.objects.create_user(username='testuser', password='testpass123')
+
+        middleware(request)
+
+        self.assertEqual(RequestLog.objects.count(), 0)
+        self.assertNotIn('https://cdn.example.com/media/', middleware._excluded_prefix_tuple)
+
+    def test_excluded_method_is_not_logged(self):
+        middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+        request = self.factory.options('/test/path/')
+        request.user = User.objects.create_user(username='testuser', password='testpass123')
+
+        middleware(request)
+
+        self.assertEqual(RequestLog.objects.count(), 0)
+
+
+class AsyncRequestLoggingTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    async def test_log_request_is_scheduled_off_the_response_path(self):
+        async def get_response(request):
+            return HttpResponse("Test response")
+
+        middleware = RequestLoggingMiddlewareAsync(get_response)
+        request = self.factory.get('/test/path/')
+
+        with patch.object(middleware, '_log_request') as log_request:
+            response = await middleware(request)
+            await asyncio.gather(*_pending_tasks)
+
+        self.assertEqual(response.status_code, 200)
+        log_request.assert_called_once_with(request, response)
+
+    async def test_log_errors_are_swallowed(self):
+        async def get_response(request):
+            return HttpResponse("Test response")
+
+        middleware = RequestLoggingMiddlewareAsync(get_response)
+        request = self.factory.get('/test/path/')
+
+        with patch.object(middleware, '_log_request', side_effect=Exception("Database error")):
+            response = await middleware(request)
+            await asyncio.gather(*_pending_tasks)
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(REQUEST_LOG_AUTHENTICATED_ONLY=True)
+    async def test_user_is_resolved_off_the_event_loop(self):
+        async def get_response(request):
+            return HttpResponse("Test response")
+
+        loop_thread = threading.get_ident()
+        user_threads = []
+
+        class RecordingUser:
+            @property
+            def is_authenticated(self):
+                user_threads.append(threading.get_ident())
+                return False
+
+        middleware = RequestLoggingMiddlewareAsync(get_response)
+        request = self.factory.get('/test/path/')
+        request.user = RecordingUser()
+
+        with patch.object(middleware, '_log_request') as log_request:
+            await middleware(request)
+            await asyncio.gather(*_pending_tasks)
+
+        self.assertTrue(user_threads)
+        self.assertNotIn(loop_thread, user_threads)
+        log_request.assert_not_called()
+
+
+@override_settings(REQUEST_LOG_SAMPLE_RATE={'2xx': 0.0, '4xx': 1.0})
+class SampledRequestLoggingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _call(self, request, status=200):
+        middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response", status=status))
+        return middleware(request)
+
+    def test_successful_requests_are_sampled_out(self):
+        request = self.factory.get('/test/path/')
+        request.user = self.user
+
+        self._call(request)
+
+        self.assertEqual(RequestLog.objects.count(), 0)
+
+    def test_client_errors_are_always_logged(self):
+        request = self.factory.get('/test/path/')
+        request.user = self.user
+
+        self._call(request, status=404)
+
+        log = RequestLog.objects.get()
+        self.assertFalse(log.sampled)
+
+    def test_authenticated_writes_are_always_logged(self):
+        request = self.factory.post('/test/path/')
+        request.user = self.user
+
+        self._call(request)
+
+        self.assertEqual(RequestLog.objects.count(), 1)
+
+    @override_settings(REQUEST_LOG_SAMPLE_RATE={'2xx': 0.5})
+    def test_sampled_rows_are_flagged(self):
+        request = self.factory.get('/test/path/')
+        request.user = self.user
+
+        with patch('audit.middleware.random.random', return_value=0.1):
+            self._call(request)
+
+        self.assertTrue(RequestLog.objects.get().sampled)
+
+
+class UserAgentInterningTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _request(self):
+        request = self.factory.get('/test/path/', HTTP_USER_AGENT='Mozilla/5.0 (X11; Linux x86_64)')
+        request.user = self.user
+        return request
+
+    def test_repeated_user_agent_is_stored_once(self):
+        middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+
+        middleware(self._request())
+        middleware(self._request())
+
+        self.assertEqual(RequestLog.objects.count(), 2)
+        self.assertEqual(UserAgent.objects.count(), 1)
+        self.assertEqual(
+            str(RequestLog.objects.first().user_agent), 'Mozilla/5.0 (X11; Linux x86_64)'
+        )
+
+    @override_settings(REQUEST_LOG_BUFFERED=True)
+    def test_buffered_writes_intern_user_agents(self):
+        with patch('audit.async_log.start_writer'):
+            middleware = RequestLoggingMiddleware(lambda r: HttpResponse("Test response"))
+            middleware(self._request())
+            middleware(self._request())
+        async_log.flush()
+
+        self.assertEqual(RequestLog.objects.filter(user_agent__isnull=False).count(), 2)
+        self.assertEqual(UserAgent.objects.count(), 1)
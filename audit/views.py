@@ -1,15 +1,83 @@
+import json
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
 from django.db.models import Q
-from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
-from django.views.decorators.cache import cache_page
+from django.http import HttpResponse, StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.views.decorators.http import condition, require_http_methods
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.generic import ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.models import User
 
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.generics import ListAPIView
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated
+
+from .constants import FILTER_HTTP_METHODS, FILTER_STATUS_CODES
+from .managers import ANALYTICS_CACHE_TIMEOUT
 from .models import RequestLog
+from .serializers import RequestLogSerializer
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+IP_ADDRESS_CHARS = frozenset('0123456789abcdefABCDEF.:')
+
+STATS_CACHE_TIMEOUT = 30
+
+
+def dumps(data):
+    """
+    Serialize to JSON bytes, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def json_response(data, status=200):
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def request_log_stats():
+    """
+    Whole-table request log stats, cached briefly for the logs page header.
+    """
+    # The logs page polls this on every load; a short TTL keeps the counts fresh enough
+    return cache.get_or_set('audit:request_log_stats:all', RequestLog.objects.get_stats, STATS_CACHE_TIMEOUT)
+
+
+def search_filter(search_query, include_users=False):
+    """
+    Build the free-text search condition so every OR branch can use an index.
+    """
+    # path icontains is served by the UPPER(path) trigram index on PostgreSQL
+    condition = Q(path__icontains=search_query)
+
+    # http_method only takes the HTTP_METHOD_CHOICES values, so match them here and use the B-tree
+    needle = search_query.upper()
+    methods = [method for method, _ in RequestLog.HTTP_METHOD_CHOICES if needle in method]
+    if methods:
+        condition |= Q(http_method__in=methods)
+
+    # remote_ip icontains is served by the UPPER(HOST(remote_ip)) trigram index on PostgreSQL;
+    # text that can't appear in an IP address is not even tried
+    if set(search_query) <= IP_ADDRESS_CHARS:
+        condition |= Q(remote_ip__icontains=search_query)
+
+    # A subquery on user_id avoids ORing across the auth_user join
+    if include_users:
+        condition |= Q(user__in=User.objects.filter(username__icontains=search_query).values('pk'))
+
+    return condition
 
 
 class RecentRequestsView(LoginRequiredMixin, ListView):
@@ -19,18 +87,20 @@ class RecentRequestsView(LoginRequiredMixin, ListView):
     paginate_by = 20
     ordering = ['-timestamp']
 
+    # Columns the list template renders; everything else on the log and user rows stays in the DB
+    list_fields = (
+        'id', 'timestamp', 'http_method', 'path', 'query_string', 'remote_ip',
+        'response_status', 'response_time_ms', 'is_staff', 'is_superuser',
+        'user', 'user__username', 'user_agent', 'user_agent__ua_text',
+    )
+
     def get_queryset(self):
-        queryset = RequestLog.objects.select_related('user').all()
+        queryset = RequestLog.objects.select_related('user', 'user_agent').only(*self.list_fields)
 
         # Filter by search query
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(path__icontains=search_query) |
-                Q(http_method__icontains=search_query) |
-                Q(remote_ip__icontains=search_query) |
-                Q(user__username__icontains=search_query)
-            )
+            queryset = queryset.filter(search_filter(search_query, include_users=True))
 
         # Filter by HTTP method
         method_filter = self.request.GET.get('method')
@@ -55,12 +125,12 @@ class RecentRequestsView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
 
         # Add statistics
-        context['stats'] = RequestLog.objects.get_stats()
-        context['total_logs'] = RequestLog.objects.count()
+        context['stats'] = request_log_stats()
+        context['total_logs'] = context['stats']['total_requests']
 
         # Add filter options
-        context['http_methods'] = RequestLog.objects.values_list('http_method', flat=True).distinct().order_by('http_method')
-        context['status_codes'] = RequestLog.objects.values_list('response_status', flat=True).distinct().order_by('response_status')
+        context['http_methods'] = FILTER_HTTP_METHODS
+        context['status_codes'] = FILTER_STATUS_CODES
 
         # Add current filters
         context['current_search'] = self.request.GET.get('search', '')
@@ -71,93 +141,140 @@ class RecentRequestsView(LoginRequiredMixin, ListView):
         return context
 
 
-@require_http_methods(["GET"])
-@cache_page(60 * 5)  # Cache for 5 minutes
-def logs_api_view(request):
+def filter_logs(queryset, params):
     """
-    API endpoint for recent requests data
+    Apply the search/method/status filters shared by the JSON endpoints.
     """
-    if not request.user.is_authenticated:
-        return JsonResponse({'error': 'Authentication required'}, status=401)
-
-    limit = min(int(request.GET.get('limit', 10)), 100)  # Max 100 records
-    offset = int(request.GET.get('offset', 0))
-
-    queryset = RequestLog.objects.select_related('user').all().order_by('-timestamp')
-
-    # Apply filters
-    search_query = request.GET.get('search')
+    search_query = params.get('search')
     if search_query:
-        queryset = queryset.filter(
-            Q(path__icontains=search_query) |
-            Q(http_method__icontains=search_query) |
-            Q(remote_ip__icontains=search_query)
-        )
+        queryset = queryset.filter(search_filter(search_query))
 
-    method_filter = request.GET.get('method')
+    method_filter = params.get('method')
     if method_filter:
         queryset = queryset.filter(http_method=method_filter)
 
-    status_filter = request.GET.get('status')
+    status_filter = params.get('status')
     if status_filter:
         queryset = queryset.filter(response_status=status_filter)
 
-    # Get paginated results
-    logs = queryset[offset:offset + limit]
-
-    data = {
-        'logs': [
-            {
-                'id': log.id,
-                'timestamp': log.timestamp.isoformat(),
-                'http_method': log.http_method,
-                'path': log.path,
-                'query_string': log.query_string,
-                'remote_ip': log.remote_ip,
-                'user_agent': log.user_agent,
-                'user': {
-                    'username': log.user.username,
-                    'email': log.user.email
-                } if log.user else None,
-                'response_status': log.response_status,
-                'response_time_ms': log.response_time_ms,
-                'request_size_bytes': log.request_size_bytes,
-                'response_size_bytes': log.response_size_bytes,
-                'is_authenticated': log.is_authenticated,
-                'is_staff': log.is_staff,
-                'is_superuser': log.is_superuser,
-                'is_successful': log.is_successful,
-                'is_client_error': log.is_client_error,
-                'is_server_error': log.is_server_error,
-            }
-            for log in logs
-        ],
-        'total_count': queryset.count(),
-        'limit': limit,
-        'offset': offset,
-        'has_more': queryset.count() > offset + limit
-    }
-
-    return JsonResponse(data)
+    return queryset
+
+
+# Columns the logs API reads straight into dicts, skipping model instantiation
+API_FIELDS = (
+    'id', 'timestamp', 'http_method', 'path', 'query_string', 'remote_ip',
+    'user_agent__ua_text', 'user__username', 'user__email',
+    'response_status', 'response_time_ms', 'request_size_bytes', 'response_size_bytes',
+    'is_authenticated', 'is_staff', 'is_superuser',
+)
+
+
+class RequestLogCursorPagination(CursorPagination):
+    # Keyset paging on the (timestamp, id) index: deep pages cost the same as the first one
+    # and no COUNT(*) is needed
+    ordering = ('-timestamp', '-id')
+    page_size = 10
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class LogsAPIView(ListAPIView):
+    """
+    API endpoint for recent requests data
+    """
+    serializer_class = RequestLogSerializer
+    pagination_class = RequestLogCursorPagination
+    # Token first so anonymous requests get a 401 with a WWW-Authenticate challenge, not a 403
+    authentication_classes = [TokenAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+    # search_filter already builds an index-friendly search; the default backends would not
+    filter_backends = []
+
+    def get_queryset(self):
+        return filter_logs(RequestLog.objects.values(*API_FIELDS), self.request.query_params)
+
+
+def _build_stats_snapshot():
+    stats = RequestLog.objects.get_stats()
+
+    # Add additional statistics
+    stats.update(RequestLog.objects.get_distributions(limit=10))
+    return {'generated_at': timezone.now(), 'stats': stats}
+
+
+def _stats_snapshot(request):
+    # Every request, including this one, adds a log row, so the newest row can't version the
+    # response; the cached snapshot's build time does, and stays put until it expires
+    if not hasattr(request, '_stats_snapshot'):
+        request._stats_snapshot = cache.get_or_set(
+            'audit:stats_snapshot', _build_stats_snapshot, ANALYTICS_CACHE_TIMEOUT
+        )
+    return request._stats_snapshot
+
+
+def _stats_etag(request):
+    return str(_stats_snapshot(request)['generated_at'].timestamp())
+
+
+def _stats_last_modified(request):
+    return _stats_snapshot(request)['generated_at']
 
 
 @require_http_methods(["GET"])
-@cache_page(60 * 10)  # Cache for 10 minutes
 def logs_stats_view(request):
     """
     API endpoint for logging statistics
     """
     if not request.user.is_authenticated:
-        return JsonResponse({'error': 'Authentication required'}, status=401)
+        return json_response({'error': 'Authentication required'}, status=401)
 
-    stats = RequestLog.objects.get_stats()
+    # Per-user data: let the browser revalidate instead of sharing it through a page cache
+    response = _stats_response(request)
+    patch_cache_control(response, private=True, max_age=ANALYTICS_CACHE_TIMEOUT, must_revalidate=True)
+    return response
 
-    # Add additional statistics
-    stats.update({
-        'top_paths': list(RequestLog.objects.get_top_paths(limit=10)),
-        'top_ips': list(RequestLog.objects.get_top_ips(limit=10)),
-        'method_distribution': list(RequestLog.objects.get_method_distribution()),
-        'hourly_distribution': list(RequestLog.objects.get_hourly_distribution()),
-    })
-
-    return JsonResponse(stats)
\ No newline at end of file
+
+@condition(etag_func=_stats_etag, last_modified_func=_stats_last_modified)
+def _stats_response(request):
+    return json_response(_stats_snapshot(request)['stats'])
+
+
+EXPORT_FIELDS = {
+    'id': 'id',
+    'timestamp': 'timestamp',
+    'http_method': 'http_method',
+    'path': 'path',
+    'query_string': 'query_string',
+    'remote_ip': 'remote_ip',
+    'user_agent': 'user_agent__ua_text',
+    'username': 'user__username',
+    'response_status': 'response_status',
+    'response_time_ms': 'response_time_ms',
+    'request_size_bytes': 'request_size_bytes',
+    'response_size_bytes': 'response_size_bytes',
+    'is_authenticated': 'is_authenticated',
+    'is_staff': 'is_staff',
+    'is_superuser': 'is_superuser',
+}
+
+
+@require_http_methods(["GET"])
+def logs_export_view(request):
+    """
+    Stream every matching request log as newline-delimited JSON
+    """
+    if not request.user.is_authenticated:
+        return json_response({'error': 'Authentication required'}, status=401)
+
+    queryset = filter_logs(RequestLog.objects.order_by('-timestamp'), request.GET).values_list(
+        *EXPORT_FIELDS.values()
+    )
+
+    def lines():
+        # iterator() fetches in chunks instead of caching the whole result set in memory
+        for row in queryset.iterator(chunk_size=2000):
+            yield dumps(dict(zip(EXPORT_FIELDS, row))) + b'\n'
+
+    response = StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="request_logs.ndjson"'
+    return response
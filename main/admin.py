@@ -1,6 +1,7 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
-from .models import CV, Skill, Project, Contact
+from .models import CV, Skill, Project, Technology, Contact
 
 
 class SkillInline(admin.TabularInline):
@@ -45,13 +46,22 @@ class CVAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # One aggregate query for the changelist instead of two COUNTs per row
+        return super().get_queryset(request).annotate(
+            _skills_count=Count('skills', distinct=True),
+            _projects_count=Count('projects', distinct=True),
+        )
+
     def skills_count(self, obj):
-        return obj.skills.count()
+        return obj._skills_count
     skills_count.short_description = 'Skills'
+    skills_count.admin_order_field = '_skills_count'
 
     def projects_count(self, obj):
-        return obj.projects.count()
+        return obj._projects_count
     projects_count.short_description = 'Projects'
+    projects_count.admin_order_field = '_projects_count'
 
 
 @admin.register(Skill)
@@ -107,6 +117,12 @@ class ProjectAdmin(admin.ModelAdmin):
     duration_display.short_description = 'Duration'
 
 
+@admin.register(Technology)
+class TechnologyAdmin(admin.ModelAdmin):
+    list_display = ['name']
+    search_fields = ['name']
+
+
 @admin.register(Contact)
 class ContactAdmin(admin.ModelAdmin):
     list_display = ['contact_type', 'value', 'cv', 'is_primary', 'is_public', 'created_at']
@@ -3,24 +3,31 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Prefetch, Count
+from django.db import connection
+from django.db.models import Count, Prefetch
 from django.shortcuts import get_object_or_404
 
 from ..models import CV, Skill, Project, Contact
 from ..serializers.cv_serializers import (
     CVListSerializer, CVDetailSerializer, CVCreateUpdateSerializer,
-    SkillSerializer, ProjectSerializer, ContactSerializer
+    SkillSerializer, ProjectSerializer, ProjectListSerializer, ContactSerializer,
+    group_skills_by_category, related_rows_by_cv, related_rows_from_json, with_related_json
 )
 
 
 class CVViewSet(viewsets.ModelViewSet):
-    queryset = CV.objects.published().select_related().prefetch_related(
-        Prefetch('skills', queryset=Skill.objects.select_related()),
-        Prefetch('projects', queryset=Project.objects.select_related()),
-        Prefetch('contacts', queryset=Contact.objects.filter(is_public=True))
-    ).annotate(
-        skills_count=Count('skills'),
-        projects_count=Count('projects')
+    queryset = CV.objects.published().prefetch_related(
+        # Prefetch in the order the detail actions return, so they can reuse the cache. Only the
+        # serialized columns are loaded; 'cv' must stay so Django can attach rows to their CV.
+        Prefetch('skills', queryset=Skill.objects.only(
+            'cv', *SkillSerializer.Meta.fields
+        ).order_by('category', 'name')),
+        Prefetch('projects', queryset=Project.objects.only(
+            'cv', *ProjectSerializer.Meta.fields
+        ).order_by('-is_featured', '-start_date')),
+        Prefetch('contacts', queryset=Contact.objects.only(
+            'cv', *ContactSerializer.Meta.fields
+        ).filter(is_public=True).order_by('contact_type'))
     ).order_by('-created_at')
 
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -41,57 +48,73 @@ class CVViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
 
         if self.action == 'list':
-            return queryset.only(
-                'id', 'first_name', 'last_name', 'bio', 'status',
-                'is_active', 'created_at', 'updated_at'
+            # The list only shows counts, so aggregate them instead of prefetching the rows,
+            # and hand the serializer plain dicts instead of CV instances
+            return queryset.prefetch_related(None).annotate(
+                skills_count=Count('skills', distinct=True),
+                projects_count=Count('projects', distinct=True),
+            ).values(
+                'id', 'first_name', 'last_name', 'status', 'is_active',
+                'created_at', 'updated_at', 'skills_count', 'projects_count'
             )
 
+        if self.action == 'retrieve' and connection.vendor == 'postgresql':
+            # PostgreSQL builds the related rows as JSON inside the CV query itself
+            return with_related_json(queryset.prefetch_related(None))
+
+        if self.action in ('retrieve', 'skills_by_category'):
+            # These read the related rows with values() instead of prefetching instances
+            return queryset.prefetch_related(None)
+
         return queryset
 
+    def retrieve(self, request, *args, **kwargs):
+        cv = self.get_object()
+        if connection.vendor == 'postgresql':
+            related_rows = related_rows_from_json(cv)
+        else:
+            related_rows = related_rows_by_cv([cv.pk])
+        context = {**self.get_serializer_context(), **related_rows}
+        return Response(CVDetailSerializer(cv, context=context).data)
+
     @action(detail=True, methods=['get'])
     def skills(self, request, pk=None):
         cv = self.get_object()
-        skills = cv.skills.all().order_by('category', 'name')
+        skills = cv.skills.all()
         serializer = SkillSerializer(skills, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def projects(self, request, pk=None):
         cv = self.get_object()
-        projects = cv.projects.all().order_by('-is_featured', '-start_date')
+        projects = cv.projects.all()
         serializer = ProjectSerializer(projects, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def contacts(self, request, pk=None):
         cv = self.get_object()
-        contacts = cv.contacts.filter(is_public=True).order_by('contact_type')
+        contacts = cv.contacts.all()
         serializer = ContactSerializer(contacts, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def featured_projects(self, request, pk=None):
         cv = self.get_object()
-        featured_projects = cv.projects.filter(is_featured=True).order_by('-start_date')
+        featured_projects = [project for project in cv.projects.all() if project.is_featured]
         serializer = ProjectSerializer(featured_projects, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def skills_by_category(self, request, pk=None):
         cv = self.get_object()
-        skills_by_category = {}
-
-        for skill in cv.skills.all().order_by('category', 'name'):
-            category = skill.get_category_display()
-            if category not in skills_by_category:
-                skills_by_category[category] = []
-            skills_by_category[category].append(SkillSerializer(skill).data)
-
-        return Response(skills_by_category)
+        # Served in (category, name) order straight from the skill_cv_category_name index
+        skills = Skill.objects.filter(cv=cv).order_by('category', 'name').values(*SkillSerializer.Meta.fields)
+        return Response(group_skills_by_category(skills))
 
 
 class SkillViewSet(viewsets.ModelViewSet):
-    queryset = Skill.objects.select_related('cv').order_by('category', 'name')
+    queryset = Skill.objects.order_by('category', 'name')
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -102,7 +125,7 @@ class SkillViewSet(viewsets.ModelViewSet):
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
-    queryset = Project.objects.select_related('cv').order_by('-is_featured', '-start_date')
+    queryset = Project.objects.order_by('-is_featured', '-start_date')
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -111,9 +134,21 @@ class ProjectViewSet(viewsets.ModelViewSet):
     ordering_fields = ['title', 'start_date', 'end_date', 'is_featured']
     ordering = ['-is_featured', '-start_date']
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ProjectListSerializer
+        return ProjectSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Search still filters on these columns; the list just never reads them back
+            return queryset.only(*ProjectListSerializer.Meta.fields)
+        return queryset
+
 
 class ContactViewSet(viewsets.ModelViewSet):
-    queryset = Contact.objects.select_related('cv').filter(is_public=True).order_by('contact_type')
+    queryset = Contact.objects.filter(is_public=True).order_by('contact_type')
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
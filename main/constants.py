@@ -11,6 +11,8 @@ SKILL_CATEGORIES = [
     ('certification', 'Certifications'),
 ]
 
+SKILL_CATEGORY_DISPLAY = dict(SKILL_CATEGORIES)
+
 PROJECT_STATUS_CHOICES = [
     ('completed', 'Completed'),
     ('in_progress', 'In Progress'),
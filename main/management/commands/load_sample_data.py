@@ -1,6 +1,16 @@
 from django.core.management.base import BaseCommand
 from django.core.management import call_command
-from django.db import transaction
+from django.db import connection, transaction
+
+from ...models import Project, Technology
+
+SAMPLE_FIXTURES = (
+    'initial_data.json',
+    'initial_cv_data.json',
+    'initial_skills_data.json',
+    'initial_projects_data.json',
+    'initial_contacts_data.json',
+)
 
 
 class Command(BaseCommand):
@@ -15,6 +25,13 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    # Both are scoped to this transaction: check FKs once at COMMIT, and
+                    # don't wait for the WAL flush of a load that can simply be rerun
+                    cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+                    cursor.execute('SET LOCAL synchronous_commit = off')
+
             if options['clear']:
                 self.stdout.write('Clearing existing data...')
                 call_command('flush', '--noinput')
@@ -22,20 +39,12 @@ class Command(BaseCommand):
                     self.style.SUCCESS('Existing data cleared')
                 )
 
-            self.stdout.write('Loading initial CV data...')
-            call_command('loaddata', 'initial_data.json')
-
-            self.stdout.write('Loading additional CV data...')
-            call_command('loaddata', 'initial_cv_data.json')
-
-            self.stdout.write('Loading skills data...')
-            call_command('loaddata', 'initial_skills_data.json')
-
-            self.stdout.write('Loading projects data...')
-            call_command('loaddata', 'initial_projects_data.json')
-
-            self.stdout.write('Loading contacts data...')
-            call_command('loaddata', 'initial_contacts_data.json')
+            # One loaddata run resolves every fixture in a single pass and resets the
+            # sequences once; later fixtures still override earlier rows with the same pk
+            self.stdout.write(f'Loading {len(SAMPLE_FIXTURES)} sample data fixtures...')
+            call_command('loaddata', *SAMPLE_FIXTURES)
+            # Fixture rows are saved raw, so their technologies are linked here
+            Technology.objects.link(Project.objects.only('technologies_used'))
 
         self.stdout.write(
             self.style.SUCCESS('Successfully loaded all sample data!')
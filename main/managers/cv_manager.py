@@ -12,6 +12,7 @@ class CVManager(models.Manager):
         return self.filter(status='draft')
 
     def by_name(self, first_name=None, last_name=None):
+        # Substring semantics kept; on PostgreSQL the UPPER() trigram indexes from main.0004 serve these
         queryset = self.all()
         if first_name:
             queryset = queryset.filter(first_name__icontains=first_name)
@@ -19,14 +20,34 @@ class CVManager(models.Manager):
             queryset = queryset.filter(last_name__icontains=last_name)
         return queryset
 
+    def _has_related(self, name, **filters):
+        # EXISTS is a semi-join: one row per CV, so no JOIN fan-out to undo with DISTINCT
+        relation = self.model._meta.get_field(name)
+        return models.Exists(relation.related_model.objects.filter(
+            **{relation.field.name: models.OuterRef('pk')}, **filters
+        ))
+
     def with_skills(self):
-        return self.filter(skills__isnull=False).distinct()
+        return self.filter(self._has_related('skills'))
 
     def with_projects(self):
-        return self.filter(projects__isnull=False).distinct()
+        return self.filter(self._has_related('projects'))
 
     def featured_projects(self):
-        return self.filter(projects__is_featured=True).distinct()
+        return self.filter(self._has_related('projects', is_featured=True))
+
+    def with_primary_contacts(self):
+        contacts = self.model._meta.get_field('contacts').related_model
+        return self.prefetch_related(models.Prefetch(
+            'contacts', queryset=contacts.objects.filter(is_primary=True), to_attr='_primary_contacts'
+        ))
+
+    def for_pdf(self):
+        # Everything CVPDFGenerator renders, in one query per relation
+        contacts = self.model._meta.get_field('contacts').related_model
+        return self.prefetch_related(
+            models.Prefetch('contacts', queryset=contacts.objects.filter(is_public=True)), 'skills', 'projects'
+        )
 
 
 class SkillManager(models.Manager):
@@ -49,7 +70,16 @@ class SkillManager(models.Manager):
         return self.filter(proficiency_level__gte=level)
 
     def by_proficiency(self, min_level=1, max_level=5):
-        return self.filter(proficiency_level__gte=min_level, proficiency_level__lte=max_level)
+        # Levels run 1-5, so only bounds that actually narrow the range become predicates
+        queryset = self.all()
+        if min_level > 1:
+            queryset = queryset.filter(proficiency_level__gte=min_level)
+        if max_level < 5:
+            queryset = queryset.filter(proficiency_level__lte=max_level)
+        return queryset
+
+    def has_skills(self, cv):
+        return self.filter(cv=cv).exists()
 
 
 class ProjectManager(models.Manager):
@@ -74,9 +104,42 @@ class ProjectManager(models.Manager):
     def by_technology(self, technology):
         return self.filter(technologies_used__icontains=technology)
 
+    def with_technology(self, name):
+        # Whole-name match through the Technology join; names differing only in case are
+        # separate rows, so one project could match twice without distinct()
+        return self.filter(technologies__name__iexact=name).distinct()
+
     def ongoing(self):
         return self.filter(status='in_progress', end_date__isnull=True)
 
+    def has_projects(self, cv):
+        return self.filter(cv=cv).exists()
+
+
+class TechnologyManager(models.Manager):
+    def for_names(self, names):
+        names = list(dict.fromkeys(names))
+        self.bulk_create([self.model(name=name) for name in names], ignore_conflicts=True)
+        return self.filter(name__in=names)
+
+    def link(self, projects):
+        """
+        Rebuild the technologies of the given saved projects from their technologies_used strings.
+        """
+        projects = [project for project in projects if project.pk is not None]
+        if not projects:
+            return
+        names = {project.pk: project.technology_names for project in projects}
+        ids = dict(self.for_names(name for project_names in names.values() for name in project_names)
+                   .values_list('name', 'pk'))
+
+        through = self.model.projects.through
+        through.objects.filter(project_id__in=names).delete()
+        through.objects.bulk_create([
+            through(project_id=project_id, technology_id=ids[name])
+            for project_id, project_names in names.items() for name in project_names
+        ], batch_size=500)
+
 
 class ContactManager(models.Manager):
     def primary(self):
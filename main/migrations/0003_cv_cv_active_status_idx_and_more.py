@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_alter_contact_contact_type_alter_contact_cv_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cv',
+            index=models.Index(fields=['is_active', 'status'], name='cv_active_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'end_date'], name='main_projec_status_272723_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['cv', 'is_featured'], name='proj_featured_partial'),
+        ),
+    ]
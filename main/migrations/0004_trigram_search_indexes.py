@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+TRIGRAM_INDEXES = (
+    ('cv_first_name_upper_trgm', 'main_cv', 'first_name'),
+    ('cv_last_name_upper_trgm', 'main_cv', 'last_name'),
+    ('project_tech_upper_trgm', 'main_project', 'technologies_used'),
+)
+
+
+def _has_pg_trgm(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # icontains compiles to UPPER(col::text) LIKE UPPER(%s) on PostgreSQL, so index that expression
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    if not _has_pg_trgm(schema_editor.connection):
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} '
+            f'ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_cv_cv_active_status_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
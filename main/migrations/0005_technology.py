@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:14
+
+from django.db import migrations, models
+
+
+def split_technologies(apps, schema_editor):
+    # Historical models don't carry TechnologyManager, so the CSV split is inlined here
+    Project = apps.get_model('main', 'Project')
+    Technology = apps.get_model('main', 'Technology')
+    Through = Project.technologies.through
+
+    names = {}
+    for pk, technologies_used in Project.objects.values_list('pk', 'technologies_used').iterator():
+        parts = (name.strip()[:64] for name in technologies_used.split(','))
+        names[pk] = list(dict.fromkeys(name for name in parts if name))
+
+    all_names = {name for project_names in names.values() for name in project_names}
+    Technology.objects.bulk_create([Technology(name=name) for name in all_names], ignore_conflicts=True)
+    ids = dict(Technology.objects.filter(name__in=all_names).values_list('name', 'pk'))
+    Through.objects.bulk_create([
+        Through(project_id=project_id, technology_id=ids[name])
+        for project_id, project_names in names.items() for name in project_names
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Technology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Technology',
+                'verbose_name_plural': 'Technologies',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='technologies',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='projects', to='main.technology'),
+        ),
+        migrations.RunPython(split_technologies, migrations.RunPython.noop),
+    ]
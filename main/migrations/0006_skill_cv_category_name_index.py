@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_technology'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['cv', 'category', 'name'], name='skill_cv_category_name'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:46
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_skill_cv_category_name_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='technology',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='technology_upper_name'),
+        ),
+    ]
@@ -1,8 +1,28 @@
+import re
 from django.db import models
+from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator, EmailValidator
+from django.db.models.functions import Upper
 from django.utils import timezone
 from .constants import CV_STATUS_CHOICES, SKILL_CATEGORIES, PROJECT_STATUS_CHOICES, CONTACT_TYPES
-from .managers.cv_manager import CVManager, SkillManager, ProjectManager, ContactManager
+from .managers.cv_manager import CVManager, SkillManager, ProjectManager, TechnologyManager, ContactManager
+
+# Built once and shared by every Contact.clean() call
+_EMAIL_VALIDATOR = EmailValidator()
+_PHONE_RE = re.compile(r'[+\- ]*\d[\d+\- ]*')
+_URL_CONTACT_TYPES = frozenset({'linkedin', 'github', 'website'})
+
+
+TECHNOLOGY_NAME_MAX_LENGTH = 64
+
+
+def split_technologies(technologies_used):
+    names = (name.strip() for name in technologies_used.split(','))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def overlong_technology_names(technologies_used):
+    return [name for name in split_technologies(technologies_used) if len(name) > TECHNOLOGY_NAME_MAX_LENGTH]
 
 
 class TimeStampedModel(models.Model):
@@ -30,6 +50,7 @@ class CV(TimeStampedModel):
             models.Index(fields=['first_name', 'last_name']),
             models.Index(fields=['status']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['is_active', 'status'], name='cv_active_status_idx'),
         ]
 
     def __str__(self):
@@ -46,6 +67,9 @@ class CV(TimeStampedModel):
         return self.projects.filter(status='in_progress')
 
     def get_primary_contact(self, contact_type):
+        # CV.objects.with_primary_contacts() prefetches these, so lookups cost no query
+        if hasattr(self, '_primary_contacts'):
+            return next((c for c in self._primary_contacts if c.contact_type == contact_type), None)
         return self.contacts.filter(contact_type=contact_type, is_primary=True).first()
 
 
@@ -64,6 +88,7 @@ class Skill(TimeStampedModel):
         ordering = ['category', 'name']
         unique_together = ['cv', 'name']
         indexes = [
+            models.Index(fields=['cv', 'category', 'name'], name='skill_cv_category_name'),
             models.Index(fields=['category']),
             models.Index(fields=['proficiency_level']),
         ]
@@ -72,6 +97,24 @@ class Skill(TimeStampedModel):
         return f"{self.name} ({self.get_category_display()})"
 
 
+class Technology(models.Model):
+    name = models.CharField(max_length=TECHNOLOGY_NAME_MAX_LENGTH, unique=True)
+
+    objects = TechnologyManager()
+
+    class Meta:
+        verbose_name = "Technology"
+        verbose_name_plural = "Technologies"
+        ordering = ['name']
+        indexes = [
+            # Serves the case-insensitive name match in ProjectManager.with_technology
+            models.Index(Upper('name'), name='technology_upper_name'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
 class Project(TimeStampedModel):
     cv = models.ForeignKey(CV, on_delete=models.CASCADE, related_name='projects')
     title = models.CharField(max_length=200, validators=[MinLengthValidator(3)])
@@ -80,6 +123,8 @@ class Project(TimeStampedModel):
     start_date = models.DateField()
     end_date = models.DateField(null=True, blank=True)
     technologies_used = models.TextField(max_length=500, blank=True)
+    # Derived from technologies_used on save, so lookups by technology are an indexed join
+    technologies = models.ManyToManyField(Technology, related_name='projects', blank=True, editable=False)
     project_url = models.URLField(blank=True)
     is_featured = models.BooleanField(default=False)
 
@@ -93,11 +138,41 @@ class Project(TimeStampedModel):
             models.Index(fields=['status']),
             models.Index(fields=['start_date']),
             models.Index(fields=['is_featured']),
+            models.Index(fields=['status', 'end_date']),
+            models.Index(fields=['cv', 'is_featured'], condition=models.Q(is_featured=True), name='proj_featured_partial'),
         ]
 
     def __str__(self):
         return self.title
 
+    def clean(self):
+        overlong = overlong_technology_names(self.technologies_used)
+        if overlong:
+            raise ValidationError({'technologies_used': (
+                f"Technology names can be at most {TECHNOLOGY_NAME_MAX_LENGTH} characters long: {', '.join(overlong)}"
+            )})
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored string so save() only relinks technologies when it changes
+        instance._saved_technologies_used = instance.__dict__.get('technologies_used')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'technologies_used' not in update_fields:
+            return
+        saved = getattr(self, '_saved_technologies_used', None)
+        if saved is None or saved != self.technologies_used:
+            Technology.objects.link([self])
+            self._saved_technologies_used = self.technologies_used
+
+    @property
+    def technology_names(self):
+        return split_technologies(self.technologies_used)
+
     @property
     def duration(self):
         if self.end_date:
@@ -132,11 +207,9 @@ class Contact(TimeStampedModel):
         return f"{self.get_contact_type_display()}: {self.value}"
 
     def clean(self):
-        from django.core.exceptions import ValidationError
-
         if self.contact_type == 'email':
-            EmailValidator()(self.value)
-        elif self.contact_type == 'phone' and not self.value.replace('+', '').replace('-', '').replace(' ', '').isdigit():
+            _EMAIL_VALIDATOR(self.value)
+        elif self.contact_type == 'phone' and not _PHONE_RE.fullmatch(self.value):
             raise ValidationError("Phone number should contain only digits, spaces, hyphens, and plus sign")
-        elif self.contact_type in ['linkedin', 'github', 'website'] and not self.value.startswith(('http://', 'https://')):
+        elif self.contact_type in _URL_CONTACT_TYPES and not self.value.startswith(('http://', 'https://')):
             self.value = f"https://{self.value}"
\ No newline at end of file
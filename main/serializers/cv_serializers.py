@@ -1,5 +1,14 @@
+from collections import defaultdict, deque
+from django.db import transaction
+from django.db.models import JSONField
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
 from rest_framework import serializers
-from ..models import CV, Skill, Project, Contact
+from ..constants import SKILL_CATEGORY_DISPLAY
+from ..models import (
+    CV, Skill, Project, Technology, Contact, TECHNOLOGY_NAME_MAX_LENGTH,
+    overlong_technology_names, split_technologies,
+)
 
 
 class ContactSerializer(serializers.ModelSerializer):
@@ -16,39 +25,139 @@ class SkillSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+def group_skills_by_category(skills_data):
+    """
+    Bucket serialized skill rows (SkillSerializer output or matching values() dicts) by category label.
+    """
+    grouped = {}
+    for data in skills_data:
+        category = SKILL_CATEGORY_DISPLAY.get(data['category'], data['category'])
+        grouped.setdefault(category, []).append(data)
+    return grouped
+
+
 class ProjectSerializer(serializers.ModelSerializer):
+    # Read from the technologies_used column the M2M is built from, so listing costs no extra query
+    technologies = serializers.ListField(source='technology_names', child=serializers.CharField(), read_only=True)
+
     class Meta:
         model = Project
         fields = [
             'id', 'title', 'description', 'status', 'start_date',
-            'end_date', 'technologies_used', 'project_url', 'is_featured'
+            'end_date', 'technologies_used', 'technologies', 'project_url', 'is_featured'
         ]
         read_only_fields = ['id']
 
+    def validate_technologies_used(self, value):
+        # Mirrors Project.clean(), which the API doesn't run; linking would fail on the long name
+        overlong = overlong_technology_names(value)
+        if overlong:
+            raise serializers.ValidationError(
+                f"Technology names can be at most {TECHNOLOGY_NAME_MAX_LENGTH} characters long: {', '.join(overlong)}"
+            )
+        return value
 
-class CVListSerializer(serializers.ModelSerializer):
-    skills_count = serializers.SerializerMethodField()
-    projects_count = serializers.SerializerMethodField()
 
+class ProjectListSerializer(serializers.ModelSerializer):
+    """
+    List representation of projects; the long text columns are left to the detail endpoint.
+    """
     class Meta:
-        model = CV
-        fields = [
-            'id', 'first_name', 'last_name', 'bio', 'status',
-            'is_active', 'created_at', 'updated_at', 'skills_count', 'projects_count'
-        ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
-
-    def get_skills_count(self, obj):
-        return obj.skills.count()
-
-    def get_projects_count(self, obj):
-        return obj.projects.count()
+        model = Project
+        fields = ['id', 'title', 'status', 'start_date', 'end_date', 'project_url', 'is_featured']
+        read_only_fields = fields
+
+
+class CVListSerializer(serializers.Serializer):
+    """
+    Read-only list representation of the CVViewSet list rows, which are values() dicts.
+    """
+    id = serializers.IntegerField(read_only=True)
+    first_name = serializers.CharField(read_only=True)
+    last_name = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    is_active = serializers.BooleanField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
+    # Annotated by CVViewSet.get_queryset for the list action
+    skills_count = serializers.IntegerField(read_only=True)
+    projects_count = serializers.IntegerField(read_only=True)
+
+
+def _rows_by_cv(queryset, fields):
+    rows_by_cv = defaultdict(list)
+    for row in queryset.values('cv_id', *fields):
+        rows_by_cv[row.pop('cv_id')].append(row)
+    return rows_by_cv
+
+
+def _finish_project_rows(rows):
+    for row in rows:
+        if not isinstance(row['start_date'], str):
+            row['start_date'] = row['start_date'].isoformat()
+            row['end_date'] = row['end_date'] and row['end_date'].isoformat()
+        row['technologies'] = split_technologies(row['technologies_used'])
+
+
+# (relation, model, values() fields, ORDER BY, extra filter) for each CV detail relation
+_DETAIL_RELATIONS = (
+    ('skills', Skill, SkillSerializer.Meta.fields, ('category', 'name'), {}),
+    ('projects', Project, [name for name in ProjectSerializer.Meta.fields if name != 'technologies'],
+     ('-is_featured', '-start_date'), {}),
+    ('contacts', Contact, ContactSerializer.Meta.fields, ('contact_type', '-is_primary'), {'is_public': True}),
+)
+
+
+def related_rows_by_cv(cv_ids):
+    """
+    Fetch the detail relations of the given CVs as plain dicts shaped like the nested
+    serializers' output, bucketed by CV id, for use as CVDetailSerializer context.
+    """
+    context = {
+        f'{name}_by_cv': _rows_by_cv(model.objects.filter(cv_id__in=cv_ids, **filters).order_by(*ordering), fields)
+        for name, model, fields, ordering, filters in _DETAIL_RELATIONS
+    }
+    for rows in context['projects_by_cv'].values():
+        _finish_project_rows(rows)
+    return context
+
+
+def _json_rows_sql(model, fields, ordering, filters):
+    columns = ', '.join(f"'{name}', r.\"{name}\"" for name in fields)
+    order_by = ', '.join(
+        f'r."{name[1:]}" DESC' if name.startswith('-') else f'r."{name}"' for name in ordering
+    )
+    conditions = ''.join(f' AND r."{name}" = %s' for name in filters)
+    return (
+        f"(SELECT COALESCE(json_agg(json_build_object({columns}) ORDER BY {order_by}), '[]')::text "
+        f'FROM "{model._meta.db_table}" r WHERE r."cv_id" = "{CV._meta.db_table}"."id"{conditions})'
+    ), tuple(filters.values())
+
+
+def with_related_json(queryset):
+    """
+    Annotate each CV with its detail relations as JSON arrays (PostgreSQL only), so a single
+    query returns everything related_rows_from_json() needs.
+    """
+    return queryset.annotate(**{
+        f'_{name}_json': RawSQL(*_json_rows_sql(model, fields, ordering, filters), output_field=JSONField())
+        for name, model, fields, ordering, filters in _DETAIL_RELATIONS
+    })
+
+
+def related_rows_from_json(cv):
+    """
+    CVDetailSerializer context built from a CV annotated by with_related_json().
+    """
+    context = {f'{name}_by_cv': {cv.pk: getattr(cv, f'_{name}_json')} for name, *_ in _DETAIL_RELATIONS}
+    _finish_project_rows(context['projects_by_cv'][cv.pk])
+    return context
 
 
 class CVDetailSerializer(serializers.ModelSerializer):
-    skills = SkillSerializer(many=True, read_only=True)
-    projects = ProjectSerializer(many=True, read_only=True)
-    contacts = ContactSerializer(many=True, read_only=True)
+    skills = serializers.SerializerMethodField()
+    projects = serializers.SerializerMethodField()
+    contacts = serializers.SerializerMethodField()
     skills_by_category = serializers.SerializerMethodField()
     featured_projects = serializers.SerializerMethodField()
     other_projects = serializers.SerializerMethodField()
@@ -62,22 +171,44 @@ class CVDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+    def to_representation(self, instance):
+        # Each relation is serialized once per CV and shared by every field that presents it
+        self._related_data = {}
+        try:
+            return super().to_representation(instance)
+        finally:
+            del self._related_data
+
+    def _serialized(self, obj, name, serializer_class):
+        if name not in self._related_data:
+            rows_by_cv = self.context.get(f'{name}_by_cv')
+            if rows_by_cv is not None:
+                # Pre-shaped values() rows from related_rows_by_cv(); no model instances at all
+                self._related_data[name] = rows_by_cv.get(obj.pk, [])
+            else:
+                self._related_data[name] = serializer_class(getattr(obj, name).all(), many=True).data
+        return self._related_data[name]
+
+    def get_skills(self, obj):
+        return self._serialized(obj, 'skills', SkillSerializer)
+
+    def get_projects(self, obj):
+        return self._serialized(obj, 'projects', ProjectSerializer)
+
+    def get_contacts(self, obj):
+        return self._serialized(obj, 'contacts', ContactSerializer)
+
     def get_skills_by_category(self, obj):
-        skills_by_category = {}
-        for skill in obj.skills.all().order_by('category', 'name'):
-            category = skill.get_category_display()
-            if category not in skills_by_category:
-                skills_by_category[category] = []
-            skills_by_category[category].append(SkillSerializer(skill).data)
-        return skills_by_category
+        # Regroups the rows get_skills() already serialized, so this adds no query of its own
+        return group_skills_by_category(self.get_skills(obj))
 
+    # Partition the serialized projects; both the viewset prefetch and
+    # Project.Meta.ordering keep each part ordered by -start_date
     def get_featured_projects(self, obj):
-        featured = obj.projects.filter(is_featured=True).order_by('-start_date')
-        return ProjectSerializer(featured, many=True).data
+        return [project for project in self.get_projects(obj) if project['is_featured']]
 
     def get_other_projects(self, obj):
-        other = obj.projects.filter(is_featured=False).order_by('-start_date')
-        return ProjectSerializer(other, many=True).data
+        return [project for project in self.get_projects(obj) if not project['is_featured']]
 
 
 class CVCreateUpdateSerializer(serializers.ModelSerializer):
@@ -93,24 +224,18 @@ class CVCreateUpdateSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
 
+    @transaction.atomic
     def create(self, validated_data):
         skills_data = validated_data.pop('skills', [])
         projects_data = validated_data.pop('projects', [])
         contacts_data = validated_data.pop('contacts', [])
 
         cv = CV.objects.create(**validated_data)
-
-        for skill_data in skills_data:
-            Skill.objects.create(cv=cv, **skill_data)
-
-        for project_data in projects_data:
-            Project.objects.create(cv=cv, **project_data)
-
-        for contact_data in contacts_data:
-            Contact.objects.create(cv=cv, **contact_data)
+        self._create_related(cv, skills_data, projects_data, contacts_data)
 
         return cv
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         skills_data = validated_data.pop('skills', None)
         projects_data = validated_data.pop('projects', None)
@@ -121,18 +246,70 @@ class CVCreateUpdateSerializer(serializers.ModelSerializer):
         instance.save()
 
         if skills_data is not None:
-            instance.skills.all().delete()
-            for skill_data in skills_data:
-                Skill.objects.create(cv=instance, **skill_data)
-
+            self._sync_related(
+                instance, Skill, skills_data, ('name',), ('category', 'proficiency_level', 'description')
+            )
         if projects_data is not None:
-            instance.projects.all().delete()
-            for project_data in projects_data:
-                Project.objects.create(cv=instance, **project_data)
-
+            created, changed = self._sync_related(instance, Project, projects_data, ('title',), (
+                'description', 'status', 'start_date', 'end_date', 'technologies_used', 'project_url', 'is_featured'
+            ))
+            # Only rows whose CSV is new or different need their technology links rebuilt
+            Technology.objects.link(created + changed.get('technologies_used', []))
         if contacts_data is not None:
-            instance.contacts.all().delete()
-            for contact_data in contacts_data:
-                Contact.objects.create(cv=instance, **contact_data)
+            self._sync_related(
+                instance, Contact, contacts_data, ('contact_type', 'is_primary'), ('value', 'is_public')
+            )
 
         return instance
+
+    def _create_related(self, cv, skills_data, projects_data, contacts_data):
+        # One multi-row INSERT per relation instead of one per item
+        if skills_data:
+            Skill.objects.bulk_create([Skill(cv=cv, **data) for data in skills_data], batch_size=500)
+        if projects_data:
+            projects = Project.objects.bulk_create([Project(cv=cv, **data) for data in projects_data], batch_size=500)
+            Technology.objects.link(projects)
+        if contacts_data:
+            Contact.objects.bulk_create([Contact(cv=cv, **data) for data in contacts_data], batch_size=500)
+
+    def _sync_related(self, cv, model, items, key_fields, fields):
+        """
+        Make cv's rows of model match items, touching only rows that differ.
+
+        Rows are matched on key_fields and compared on fields; values omitted from an item
+        fall back to the model defaults, just as a fresh insert would. Returns the created
+        rows and a {field name: updated rows whose value for it changed} mapping.
+        """
+        # Read fresh rather than from a prefetch, which may be filtered (e.g. public contacts only).
+        # Keys need not be unique, so each key holds its rows in pk order and they are paired off in turn
+        existing = defaultdict(deque)
+        for obj in model.objects.filter(cv=cv).order_by('pk'):
+            existing[tuple(getattr(obj, name) for name in key_fields)].append(obj)
+
+        to_create, to_update, changed_rows = [], [], defaultdict(list)
+        now = timezone.now()
+        for data in items:
+            incoming = model(cv=cv, **data)
+            matches = existing.get(tuple(getattr(incoming, name) for name in key_fields))
+            obj = matches.popleft() if matches else None
+            if obj is None:
+                to_create.append(incoming)
+                continue
+            changed = [name for name in fields if getattr(obj, name) != getattr(incoming, name)]
+            if changed:
+                for name in changed:
+                    setattr(obj, name, getattr(incoming, name))
+                # bulk_update skips pre_save, so auto_now has to be applied by hand
+                obj.updated_at = now
+                to_update.append(obj)
+                for name in changed:
+                    changed_rows[name].append(obj)
+
+        stale = [obj.pk for rows in existing.values() for obj in rows]
+        if stale:
+            model.objects.filter(pk__in=stale).delete()
+        if to_update:
+            model.objects.bulk_update(to_update, [*sorted(changed_rows), 'updated_at'], batch_size=500)
+        if to_create:
+            to_create = model.objects.bulk_create(to_create, batch_size=500)
+        return to_create, changed_rows
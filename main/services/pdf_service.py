@@ -1,4 +1,8 @@
+import io
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter, itemgetter
 from typing import Dict, Any, BinaryIO
 from django.http import HttpResponse
 from reportlab.lib.pagesizes import letter, A4
@@ -7,92 +11,151 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from ..constants import SKILL_CATEGORY_DISPLAY
 from ..models import CV
 
 
 class PDFGenerator(ABC):
     @abstractmethod
-    def generate(self, data: Dict[str, Any]) -> BinaryIO:
+    def generate_to_stream(self, cv: CV, stream: BinaryIO) -> None:
         pass
 
+    @abstractmethod
+    def generate(self, cv: CV) -> bytes:
+        pass
+
+
+@lru_cache(maxsize=1)
+def _cv_styles():
+    # Styles are deterministic and never mutated while rendering, so every generator shares one sheet
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='CVTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        textColor=colors.darkblue
+    ))
+
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=16,
+        spaceAfter=12,
+        spaceBefore=20,
+        textColor=colors.darkblue,
+        borderWidth=1,
+        borderColor=colors.darkblue,
+        borderPadding=5
+    ))
+
+    styles.add(ParagraphStyle(
+        name='SkillItem',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        leftIndent=20
+    ))
+
+    # Several skills share one Paragraph; the extra leading stands in for SkillItem's per-line
+    # spaceAfter so the lines keep the pitch they had as separate paragraphs
+    styles.add(ParagraphStyle(
+        name='SkillList',
+        parent=styles['SkillItem'],
+        leading=styles['SkillItem'].leading + styles['SkillItem'].spaceAfter,
+        spaceAfter=0
+    ))
+
+    styles.add(ParagraphStyle(
+        name='ProjectTitle',
+        parent=styles['Heading3'],
+        fontSize=12,
+        spaceAfter=6,
+        textColor=colors.darkgreen
+    ))
+
+    return styles
+
+
+def prepare_cv_data(cv: CV) -> Dict[str, Any]:
+    """
+    Flatten a CV into the plain values the PDF renders, with choice labels already resolved.
+
+    Uses .all() throughout so a CV from CV.objects.for_pdf() is read without further queries.
+    """
+    return {
+        'full_name': cv.full_name,
+        'bio': cv.bio,
+        'contacts': [
+            {'type': contact.get_contact_type_display(), 'value': contact.value}
+            for contact in cv.contacts.all() if contact.is_public
+        ],
+        # Skill.Meta.ordering already sorts by category, so this stable sort is a linear pass
+        'skills': [
+            {
+                'name': skill.name,
+                'category': SKILL_CATEGORY_DISPLAY.get(skill.category, skill.category),
+                'proficiency_level': skill.proficiency_level,
+                'description': skill.description,
+            }
+            for skill in sorted(cv.skills.all(), key=attrgetter('category'))
+        ],
+        'projects': [
+            {
+                'title': project.title,
+                'status': project.get_status_display() if project.status else '',
+                'duration': _project_duration(project),
+                'technologies_used': project.technologies_used,
+                'project_url': project.project_url,
+                'description': project.description,
+            }
+            for project in cv.projects.all()
+        ],
+    }
+
+
+def _project_duration(project) -> str:
+    if not project.start_date:
+        return ''
+    end_date = project.end_date.strftime("%B %Y") if project.end_date else "Present"
+    return f"{project.start_date.strftime('%B %Y')} - {end_date}"
+
 
 class CVPDFGenerator(PDFGenerator):
     def __init__(self, page_size=A4):
         self.page_size = page_size
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-
-    def _setup_custom_styles(self):
-        self.styles.add(ParagraphStyle(
-            name='CVTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue
-        ))
-
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            spaceBefore=20,
-            textColor=colors.darkblue,
-            borderWidth=1,
-            borderColor=colors.darkblue,
-            borderPadding=5
-        ))
-
-        self.styles.add(ParagraphStyle(
-            name='SkillItem',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=6,
-            leftIndent=20
-        ))
-
-        self.styles.add(ParagraphStyle(
-            name='ProjectTitle',
-            parent=self.styles['Heading3'],
-            fontSize=12,
-            spaceAfter=6,
-            textColor=colors.darkgreen
-        ))
-
-    def generate(self, cv: CV) -> BinaryIO:
-        buffer = HttpResponse(content_type='application/pdf')
-        buffer['Content-Disposition'] = f'attachment; filename="{cv.full_name.replace(" ", "_")}_CV.pdf"'
-
-        doc = SimpleDocTemplate(buffer, pagesize=self.page_size)
+        self.styles = _cv_styles()
+
+    def generate_to_stream(self, cv: CV, stream: BinaryIO) -> None:
+        doc = SimpleDocTemplate(stream, pagesize=self.page_size)
+        data = prepare_cv_data(cv)
         story = []
 
-        story.extend(self._build_header(cv))
-        story.extend(self._build_contact_info(cv))
-        story.extend(self._build_bio(cv))
-        story.extend(self._build_skills(cv))
-        story.extend(self._build_projects(cv))
+        story.extend(self._build_header(data))
+        story.extend(self._build_contact_info(data))
+        story.extend(self._build_bio(data))
+        story.extend(self._build_skills(data))
+        story.extend(self._build_projects(data))
 
         doc.build(story)
-        return buffer
 
-    def _build_header(self, cv: CV) -> list:
+    def generate(self, cv: CV) -> bytes:
+        buffer = io.BytesIO()
+        self.generate_to_stream(cv, buffer)
+        return buffer.getvalue()
+
+    def _build_header(self, data: Dict[str, Any]) -> list:
         return [
-            Paragraph(cv.full_name, self.styles['CVTitle']),
+            Paragraph(data['full_name'], self.styles['CVTitle']),
             Spacer(1, 12)
         ]
 
-    def _build_contact_info(self, cv: CV) -> list:
-        contacts = cv.contacts.filter(is_public=True)
-        if not contacts.exists():
+    def _build_contact_info(self, data: Dict[str, Any]) -> list:
+        if not data['contacts']:
             return []
 
-        contact_data = []
-        for contact in contacts:
-            contact_data.append([
-                contact.get_contact_type_display(),
-                contact.value
-            ])
+        contact_data = [[contact['type'], contact['value']] for contact in data['contacts']]
 
         contact_table = Table(contact_data, colWidths=[1.5*inch, 4*inch])
         contact_table.setStyle(TableStyle([
@@ -108,93 +171,86 @@ class CVPDFGenerator(PDFGenerator):
             Spacer(1, 12)
         ]
 
-    def _build_bio(self, cv: CV) -> list:
-        if not cv.bio:
+    def _build_bio(self, data: Dict[str, Any]) -> list:
+        if not data['bio']:
             return []
 
         return [
             Paragraph("Professional Summary", self.styles['SectionHeader']),
-            Paragraph(cv.bio, self.styles['Normal']),
+            Paragraph(data['bio'], self.styles['Normal']),
             Spacer(1, 12)
         ]
 
-    def _build_skills(self, cv: CV) -> list:
-        skills = cv.skills.all()
-        if not skills.exists():
+    def _build_skills(self, data: Dict[str, Any]) -> list:
+        if not data['skills']:
             return []
 
-        skills_by_category = {}
-        for skill in skills:
-            category = skill.get_category_display()
-            if category not in skills_by_category:
-                skills_by_category[category] = []
-            skills_by_category[category].append(skill)
-
         story = [Paragraph("Skills & Expertise", self.styles['SectionHeader'])]
 
-        for category, category_skills in skills_by_category.items():
+        for category, category_skills in groupby(data['skills'], key=itemgetter('category')):
             story.append(Paragraph(f"<b>{category}</b>", self.styles['Normal']))
+            skill_lines = []
             for skill in category_skills:
-                skill_text = f"• {skill.name} ({skill.proficiency_level}/5)"
-                if skill.description:
-                    skill_text += f" - {skill.description}"
-                story.append(Paragraph(skill_text, self.styles['SkillItem']))
+                skill_text = f"• {skill['name']} ({skill['proficiency_level']}/5)"
+                if skill['description']:
+                    skill_text += f" - {skill['description']}"
+                skill_lines.append(skill_text)
+            # One flowable per category: every Paragraph costs its own parse and wrap pass in doc.build
+            story.append(Paragraph("<br/>".join(skill_lines), self.styles['SkillList']))
             story.append(Spacer(1, 6))
 
         story.append(Spacer(1, 12))
         return story
 
-    def _build_projects(self, cv: CV) -> list:
-        projects = cv.projects.all()
-        if not projects.exists():
+    def _build_projects(self, data: Dict[str, Any]) -> list:
+        if not data['projects']:
             return []
 
         story = [Paragraph("Projects", self.styles['SectionHeader'])]
 
-        for project in projects:
-            story.append(Paragraph(project.title, self.styles['ProjectTitle']))
+        for project in data['projects']:
+            story.append(Paragraph(project['title'], self.styles['ProjectTitle']))
 
             project_info = []
-            if project.status:
-                project_info.append(f"<b>Status:</b> {project.get_status_display()}")
-            if project.start_date:
-                end_date = project.end_date.strftime("%B %Y") if project.end_date else "Present"
-                project_info.append(f"<b>Duration:</b> {project.start_date.strftime('%B %Y')} - {end_date}")
-            if project.technologies_used:
-                project_info.append(f"<b>Technologies:</b> {project.technologies_used}")
-            if project.project_url:
-                project_info.append(f"<b>URL:</b> {project.project_url}")
-
-            for info in project_info:
-                story.append(Paragraph(info, self.styles['Normal']))
-
-            if project.description:
-                story.append(Paragraph(project.description, self.styles['Normal']))
+            if project['status']:
+                project_info.append(f"<b>Status:</b> {project['status']}")
+            if project['duration']:
+                project_info.append(f"<b>Duration:</b> {project['duration']}")
+            if project['technologies_used']:
+                project_info.append(f"<b>Technologies:</b> {project['technologies_used']}")
+            if project['project_url']:
+                project_info.append(f"<b>URL:</b> {project['project_url']}")
+
+            if project_info:
+                story.append(Paragraph("<br/>".join(project_info), self.styles['Normal']))
+
+            if project['description']:
+                story.append(Paragraph(project['description'], self.styles['Normal']))
 
             story.append(Spacer(1, 12))
 
         return story
 
 
+@lru_cache(maxsize=1)
+def _default_generator():
+    return CVPDFGenerator()
+
+
 class PDFService:
     def __init__(self, generator: PDFGenerator = None):
-        self.generator = generator or CVPDFGenerator()
+        # generate() keeps no state between calls, so the default generator is shared
+        self.generator = generator or _default_generator()
 
     def generate_cv_pdf(self, cv: CV) -> HttpResponse:
-        return self.generator.generate(cv)
+        return self._pdf_response(cv, 'attachment')
 
     def generate_cv_pdf_inline(self, cv: CV) -> HttpResponse:
-        buffer = HttpResponse(content_type='application/pdf')
-        buffer['Content-Disposition'] = f'inline; filename="{cv.full_name.replace(" ", "_")}_CV.pdf"'
-
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        story = []
-
-        story.extend(self.generator._build_header(cv))
-        story.extend(self.generator._build_contact_info(cv))
-        story.extend(self.generator._build_bio(cv))
-        story.extend(self.generator._build_skills(cv))
-        story.extend(self.generator._build_projects(cv))
-
-        doc.build(story)
-        return buffer
+        return self._pdf_response(cv, 'inline')
+
+    def _pdf_response(self, cv: CV, disposition: str) -> HttpResponse:
+        # ReportLab writes the finished document straight into the response, so it is held once
+        response = HttpResponse(content_type='application/pdf')
+        response['Content-Disposition'] = f'{disposition}; filename="{cv.full_name.replace(" ", "_")}_CV.pdf"'
+        self.generator.generate_to_stream(cv, response)
+        return response
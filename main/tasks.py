@@ -1,43 +1,103 @@
 from celery import shared_task
-from django.core.mail import EmailMessage
+from celery.signals import worker_process_shutdown
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
 from django.conf import settings
-from .services.pdf_service import PDFService
+from .services.pdf_service import PDFService, prepare_cv_data
 from .models import CV
+from concurrent.futures import ThreadPoolExecutor
+from smtplib import SMTPServerDisconnected
+from string import Template
+import hashlib
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
-@shared_task(bind=True)
-def send_cv_pdf_email(self, cv_id, recipient_email, sender_name=None):
-    try:
-        cv = CV.objects.get(id=cv_id)
-        pdf_service = PDFService()
-        pdf_buffer = pdf_service.generator.generate(cv)
+PDF_CACHE_TIMEOUT = 24 * 60 * 60
 
-        subject = f"CV of {cv.first_name} {cv.last_name}"
-        message = f"""
-Hello,
+# Parsed once at import instead of rebuilding the body for every message
+CV_EMAIL_BODY = Template("""Hello,
 
-Please find attached the CV of {cv.first_name} {cv.last_name}.
+Please find attached the CV of $cv_name.
 
 Best regards,
-{sender_name or 'CV Project Team'}
-        """.strip()
-
-        email = EmailMessage(
-            subject=subject,
-            body=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[recipient_email],
-        )
-
-        email.attach(
-            filename=f"{cv.first_name}_{cv.last_name}_CV.pdf",
-            content=pdf_buffer.getvalue(),
-            mimetype='application/pdf'
-        )
+$sender_name""")
+
+# One mail connection per worker process, opened on first use and kept across tasks
+_connection = None
+
+
+def _get_shared_connection():
+    global _connection
+    if _connection is None:
+        _connection = get_connection()
+        # Opened up front so the backend doesn't close it again after each send
+        _connection.open()
+    return _connection
+
+
+@worker_process_shutdown.connect
+def _close_shared_connection(**kwargs):
+    global _connection
+    if _connection is not None:
+        _connection.close()
+        _connection = None
 
+
+def _send_on_shared_connection(email):
+    email.connection = _get_shared_connection()
+    try:
         email.send()
+    except SMTPServerDisconnected:
+        # The server dropped the idle connection; reconnect once and retry
+        email.connection.close()
+        email.connection.open()
+        email.send()
+
+
+def cv_pdf_cache_key(cv):
+    # Hash exactly what the PDF renders, so an edited CV simply maps to a new key and
+    # stale entries age out on their own instead of needing invalidation
+    digest = hashlib.blake2b(
+        json.dumps(prepare_cv_data(cv), sort_keys=True, default=str).encode(), digest_size=16
+    ).hexdigest()
+    return f'cvpdf:{digest}'
+
+
+def get_cv_pdf(cv, pdf_service=None):
+    pdf_service = pdf_service or PDFService()
+    return cache.get_or_set(
+        cv_pdf_cache_key(cv), lambda: pdf_service.generator.generate(cv), PDF_CACHE_TIMEOUT
+    )
+
+
+def build_cv_pdf_email(cv, recipient_email, sender_name=None, pdf_service=None, connection=None, pdf=None):
+    if pdf is None:
+        pdf = get_cv_pdf(cv, pdf_service)
+
+    cv_name = f"{cv.first_name} {cv.last_name}"
+    email = EmailMessage(
+        subject=f"CV of {cv_name}",
+        body=CV_EMAIL_BODY.substitute(cv_name=cv_name, sender_name=sender_name or 'CV Project Team'),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient_email],
+        connection=connection,
+    )
+
+    email.attach(
+        filename=f"{cv.first_name}_{cv.last_name}_CV.pdf",
+        content=pdf,
+        mimetype='application/pdf'
+    )
+    return email
+
+
+@shared_task(bind=True)
+def send_cv_pdf_email(self, cv_id, recipient_email, sender_name=None):
+    try:
+        cv = CV.objects.for_pdf().get(id=cv_id)
+        _send_on_shared_connection(build_cv_pdf_email(cv, recipient_email, sender_name))
         logger.info(f"CV PDF sent successfully to {recipient_email} for CV {cv_id}")
 
         return {
@@ -62,6 +122,62 @@ Best regards,
             'message': error_msg
         }
 
+
+@shared_task
+def send_cv_pdf_emails_batch(jobs):
+    """
+    Send many CV PDFs over one SMTP connection per chunk of CV_EMAIL_BATCH_SIZE jobs.
+
+    jobs is a list of (cv_id, recipient_email, sender_name) triples. The batch is aborted
+    once more than a third of its jobs (and more than one) have failed, since that points at
+    a broken mail server rather than bad individual jobs. PDFs are rendered one job ahead on
+    a small thread pool, so ReportLab work overlaps with the SMTP round trips of the previous message.
+    """
+    chunk_size = getattr(settings, 'CV_EMAIL_BATCH_SIZE', 50)
+    # Floor of 1 so one bad job can't abort a batch too small to have a third
+    max_failures = max(1, len(jobs) // 3)
+    cvs = CV.objects.for_pdf().in_bulk({cv_id for cv_id, _, _ in jobs})
+    pdf_service = PDFService()
+    sent, failed = 0, []
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        def render(index):
+            # Everything the PDF reads is prefetched, so the worker thread never queries the DB
+            cv = cvs.get(jobs[index][0]) if index < len(jobs) else None
+            return executor.submit(get_cv_pdf, cv, pdf_service) if cv is not None else None
+
+        # Job i+1 renders while job i is on the wire, hiding most of the PDF cost behind SMTP
+        pending = render(0)
+        for start in range(0, len(jobs), chunk_size):
+            connection = get_connection()
+            connection.open()
+            try:
+                for index in range(start, min(start + chunk_size, len(jobs))):
+                    cv_id, recipient_email, sender_name = jobs[index]
+                    future, pending = pending, render(index + 1)
+                    try:
+                        if future is None:
+                            raise CV.DoesNotExist(f"CV with ID {cv_id} not found")
+                        email = build_cv_pdf_email(
+                            cvs[cv_id], recipient_email, sender_name, connection=connection, pdf=future.result()
+                        )
+                        connection.send_messages([email])
+                        sent += 1
+                    except Exception as e:
+                        logger.error(f"Failed to send CV PDF for CV {cv_id} to {recipient_email}: {e}")
+                        failed.append(cv_id)
+                        if len(failed) > max_failures:
+                            logger.error(f"Aborting CV PDF batch after {len(failed)} failures")
+                            if pending is not None:
+                                pending.cancel()
+                            return {'status': 'aborted', 'sent': sent, 'failed': failed}
+            finally:
+                connection.close()
+
+    logger.info(f"CV PDF batch finished: {sent} sent, {len(failed)} failed")
+    return {'status': 'success' if not failed else 'partial', 'sent': sent, 'failed': failed}
+
+
 @shared_task
 def debug_task():
     return "Celery is working correctly!"
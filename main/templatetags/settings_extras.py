@@ -45,6 +45,43 @@ def is_dict(value):
     return isinstance(value, dict)
 
 
+def _format_bool(value):
+    return 'True' if value else 'False'
+
+
+def _format_sequence(value):
+    return f"[{', '.join(map(str, value))}]"
+
+
+def _format_dict(value):
+    return f"{{ {', '.join(f'{k}: {v}' for k, v in value.items())} }}"
+
+
+def _format_str(value):
+    return f"{value[:100]}..." if len(value) > 100 else str(value)
+
+
+# Keyed on the exact type; subclasses are resolved once by _formatter_for() and memoized here
+_FORMATTERS = {
+    bool: _format_bool,
+    list: _format_sequence,
+    tuple: _format_sequence,
+    dict: _format_dict,
+    str: _format_str,
+}
+
+
+def _formatter_for(value_type):
+    for base, formatter in ((bool, _format_bool), ((list, tuple), _format_sequence),
+                            (dict, _format_dict), (str, _format_str)):
+        if issubclass(value_type, base):
+            break
+    else:
+        formatter = str
+    _FORMATTERS[value_type] = formatter
+    return formatter
+
+
 @register.filter
 def format_setting_value(value):
     """
@@ -52,13 +89,6 @@ def format_setting_value(value):
 
     Usage: {{ value|format_setting_value }}
     """
-    if isinstance(value, bool):
-        return 'True' if value else 'False'
-    elif isinstance(value, (list, tuple)):
-        return f"[{', '.join(map(str, value))}]"
-    elif isinstance(value, dict):
-        return f"{{ {', '.join(f'{k}: {v}' for k, v in value.items())} }}"
-    elif isinstance(value, str) and len(value) > 100:
-        return f"{value[:100]}..."
-    else:
-        return str(value)
+    value_type = type(value)
+    formatter = _FORMATTERS.get(value_type) or _formatter_for(value_type)
+    return formatter(value)
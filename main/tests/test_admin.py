@@ -0,0 +1,35 @@
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from ..models import CV, Skill, Project
+
+
+class CVAdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        for i in range(3):
+            cv = CV.objects.create(first_name='John', last_name=f'Doe{i}', status='published')
+            Skill.objects.create(cv=cv, name='Python', category='technical')
+            Skill.objects.create(cv=cv, name='Django', category='technical')
+            Project.objects.create(cv=cv, title='Project A', description='Test', start_date='2024-01-01')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.login(username='admin', password='testpass123')
+
+    def test_changelist_counts_without_per_row_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('admin:main_cv_changelist'))
+
+        self.assertEqual(response.status_code, 200)
+        per_row = [q for q in ctx.captured_queries if 'WHERE "main_skill"."cv_id" =' in q['sql']]
+        self.assertEqual(per_row, [])
+        self.assertContains(response, '<td class="field-skills_count">2</td>', count=3, html=True)
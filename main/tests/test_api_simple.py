@@ -1,11 +1,18 @@
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.db.models import Prefetch
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from unittest import skipUnless
+from unittest.mock import patch
 import json
 
-from ..models import CV, Skill, Project, Contact
+from ..models import CV, Skill, Project, Technology, Contact
+from ..serializers.cv_serializers import SkillSerializer, ProjectSerializer, CVDetailSerializer
 
 
 class CVAPITestCase(APITestCase):
@@ -38,6 +45,48 @@ class CVAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('results', response.data)
 
+    def test_cv_list_counts_in_one_query(self):
+        for i in range(3):
+            cv = CV.objects.create(**self.cv_data)
+            for name in ('Python', 'Django'):
+                Skill.objects.create(cv=cv, name=name, category='technical')
+            for title in ('Project A', 'Project B', 'Project C'):
+                Project.objects.create(cv=cv, title=title, description='Test', start_date='2024-01-01')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/cvs/')
+
+        related_queries = [
+            q for q in ctx.captured_queries
+            if 'FROM "main_skill"' in q['sql'] or 'FROM "main_project"' in q['sql']
+        ]
+        self.assertEqual(related_queries, [])
+        self.assertEqual(
+            [(cv['skills_count'], cv['projects_count']) for cv in response.data['results']],
+            [(2, 3)] * 3
+        )
+
+    def test_cv_list_omits_bio(self):
+        CV.objects.create(**self.cv_data)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/cvs/')
+
+        self.assertNotIn('bio', response.data['results'][0])
+        list_sql = [q['sql'] for q in ctx.captured_queries if 'COUNT(DISTINCT' in q['sql']]
+        self.assertNotIn('"main_cv"."bio"', list_sql[0].split(' FROM ')[0])
+
+    def test_cv_list_search_on_skills_returns_each_cv_once(self):
+        cv = CV.objects.create(**self.cv_data)
+        for name in ('Python', 'PyTorch'):
+            Skill.objects.create(cv=cv, name=name, category='technical')
+
+        response = self.client.get('/api/cvs/', {'search': 'Py'})
+
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['skills_count'], 2)
+        self.assertEqual(response.data['results'][0]['first_name'], 'John')
+
     def test_cv_create_unauthorized(self):
         response = self.client.post('/api/cvs/', self.cv_data)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -49,6 +98,141 @@ class CVAPITestCase(APITestCase):
         self.assertEqual(CV.objects.count(), 1)
         self.assertEqual(CV.objects.first().first_name, 'John')
 
+    def test_cv_create_with_nested_rows_inserts_once_per_relation(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        payload = {
+            **self.cv_data,
+            'skills': [
+                {'name': name, 'category': 'technical', 'proficiency_level': 3}
+                for name in ('Python', 'Django', 'SQL')
+            ],
+            'projects': [
+                {'title': title, 'description': 'Test', 'start_date': '2024-01-01'}
+                for title in ('Project A', 'Project B')
+            ],
+        }
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/cvs/', json.dumps(payload), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        inserts = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len([sql for sql in inserts if '"main_skill"' in sql]), 1)
+        self.assertEqual(len([sql for sql in inserts if '"main_project"' in sql]), 1)
+        cv = CV.objects.get()
+        self.assertEqual(cv.skills.count(), 3)
+        self.assertEqual(cv.projects.count(), 2)
+        self.assertEqual(len(response.data['skills']), 3)
+
+    def test_cv_create_links_project_technologies(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        payload = {
+            **self.cv_data,
+            'projects': [
+                {'title': 'Project A', 'description': 'Test', 'start_date': '2024-01-01',
+                 'technologies_used': 'Python, Django'},
+                {'title': 'Project B', 'description': 'Test', 'start_date': '2024-01-01',
+                 'technologies_used': 'Django, React'},
+            ],
+        }
+
+        response = self.client.post('/api/cvs/', json.dumps(payload), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [p['technologies'] for p in response.data['projects']], [['Python', 'Django'], ['Django', 'React']]
+        )
+        self.assertEqual(
+            sorted(Project.objects.with_technology('django').values_list('title', flat=True)), ['Project A', 'Project B']
+        )
+
+    def test_cv_create_rejects_overlong_technology_names(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        payload = {**self.cv_data, 'projects': [
+            {'title': 'Project A', 'description': 'Test', 'start_date': '2024-01-01',
+             'technologies_used': 'Python, ' + 'x' * 65},
+        ]}
+
+        response = self.client.post('/api/cvs/', json.dumps(payload), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('technologies_used', response.data['projects'][0])
+        self.assertFalse(CV.objects.exists())
+
+    def test_cv_update_replaces_nested_rows(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        cv = CV.objects.create(**self.cv_data)
+        Skill.objects.create(cv=cv, name='Old', category='technical')
+        payload = {**self.cv_data, 'skills': [{'name': 'New', 'category': 'soft', 'proficiency_level': 2}]}
+
+        response = self.client.put(f'/api/cvs/{cv.pk}/', json.dumps(payload), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(cv.skills.values_list('name', flat=True)), ['New'])
+
+    def test_cv_update_writes_only_changed_nested_rows(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        cv = CV.objects.create(**self.cv_data)
+        skills = [
+            Skill.objects.create(cv=cv, name=name, category='technical', proficiency_level=3)
+            for name in ('Python', 'Django', 'SQL', 'Go')
+        ]
+        payload = {**self.cv_data, 'skills': [
+            {'name': 'Python', 'category': 'technical', 'proficiency_level': 5},
+            {'name': 'Django', 'category': 'technical', 'proficiency_level': 3},
+            {'name': 'SQL', 'category': 'technical', 'proficiency_level': 3},
+            {'name': 'Rust', 'category': 'technical', 'proficiency_level': 1},
+        ]}
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.put(f'/api/cvs/{cv.pk}/', json.dumps(payload), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        skill_writes = [
+            q['sql'].split()[0] for q in ctx.captured_queries
+            if '"main_skill"' in q['sql'] and not q['sql'].startswith('SELECT')
+        ]
+        self.assertEqual(sorted(skill_writes), ['DELETE', 'INSERT', 'UPDATE'])
+        self.assertEqual(
+            dict(cv.skills.values_list('name', 'proficiency_level')),
+            {'Python': 5, 'Django': 3, 'SQL': 3, 'Rust': 1}
+        )
+        # Untouched rows keep their identity
+        self.assertEqual(Skill.objects.get(name='Django').pk, skills[1].pk)
+        self.assertEqual(Skill.objects.get(name='Python').pk, skills[0].pk)
+
+    def test_cv_update_replaces_projects_with_duplicate_titles(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        cv = CV.objects.create(**self.cv_data)
+        first = Project.objects.create(cv=cv, title='Tool', description='First', start_date='2024-01-01')
+        Project.objects.create(cv=cv, title='Tool', description='Second', start_date='2024-01-01')
+        payload = {**self.cv_data, 'projects': [{'title': 'Tool', 'description': 'Only', 'start_date': '2024-01-01'}]}
+
+        response = self.client.put(f'/api/cvs/{cv.pk}/', json.dumps(payload), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(cv.projects.values_list('pk', 'description')), [(first.pk, 'Only')])
+
+    def test_cv_update_relinks_only_projects_with_new_technologies(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        cv = CV.objects.create(**self.cv_data)
+        for title in ('Web', 'Infra'):
+            Project.objects.create(
+                cv=cv, title=title, description='Test', start_date='2024-01-01', technologies_used='Python'
+            )
+        payload = {**self.cv_data, 'projects': [
+            {'title': 'Web', 'description': 'Changed', 'start_date': '2024-01-01', 'technologies_used': 'Python'},
+            {'title': 'Infra', 'description': 'Test', 'start_date': '2024-01-01', 'technologies_used': 'Go'},
+            {'title': 'New', 'description': 'Test', 'start_date': '2024-01-01', 'technologies_used': 'Rust'},
+        ]}
+
+        with patch.object(Technology.objects, 'link', wraps=Technology.objects.link) as link:
+            response = self.client.put(f'/api/cvs/{cv.pk}/', json.dumps(payload), content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(project.title for project in link.call_args.args[0]), ['Infra', 'New'])
+        self.assertEqual(list(Project.objects.with_technology('python').values_list('title', flat=True)), ['Web'])
+
     def test_cv_retrieve_unauthorized(self):
         cv = CV.objects.create(**self.cv_data)
         response = self.client.get(f'/api/cvs/{cv.pk}/')
@@ -197,6 +381,138 @@ class CVAPITestCase(APITestCase):
         self.assertIn('Technical', response.data)
         self.assertEqual(len(response.data['Technical']), 1)
 
+    def test_cv_skills_by_category_reuses_prefetched_skills(self):
+        cv = CV.objects.create(**self.cv_data)
+        for name, category in (('Python', 'technical'), ('Go', 'technical'), ('English', 'language')):
+            Skill.objects.create(cv=cv, name=name, category=category, proficiency_level=3)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/cvs/{cv.pk}/skills_by_category/')
+
+        skill_queries = [q for q in ctx.captured_queries if 'FROM "main_skill"' in q['sql']]
+        self.assertEqual(len(skill_queries), 1)
+        self.assertEqual([s['name'] for s in response.data['Technical']], ['Go', 'Python'])
+
+    def test_cv_detail_skills_by_category_reuses_prefetched_skills(self):
+        cv = CV.objects.create(**self.cv_data)
+        for name, category in (('Python', 'technical'), ('Go', 'technical'), ('English', 'language')):
+            Skill.objects.create(cv=cv, name=name, category=category, proficiency_level=3)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/cvs/{cv.pk}/')
+
+        skill_queries = [q for q in ctx.captured_queries if 'FROM "main_skill"' in q['sql']]
+        self.assertEqual(len(skill_queries), 1)
+        self.assertEqual([s['name'] for s in response.data['skills_by_category']['Technical']], ['Go', 'Python'])
+        self.assertEqual(len(response.data['skills_by_category']['Languages']), 1)
+
+    def test_cv_detail_partitions_prefetched_projects(self):
+        cv = CV.objects.create(**self.cv_data)
+        for title, start_date, is_featured in (
+            ('Old featured', '2022-01-01', True),
+            ('New featured', '2024-01-01', True),
+            ('Side project', '2023-01-01', False),
+        ):
+            Project.objects.create(
+                cv=cv, title=title, description='Test', start_date=start_date, is_featured=is_featured
+            )
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/cvs/{cv.pk}/')
+
+        project_queries = [q for q in ctx.captured_queries if 'FROM "main_project"' in q['sql']]
+        self.assertEqual(len(project_queries), 1)
+        self.assertEqual(
+            [p['title'] for p in response.data['featured_projects']], ['New featured', 'Old featured']
+        )
+        self.assertEqual([p['title'] for p in response.data['other_projects']], ['Side project'])
+
+    def test_cv_detail_builds_related_rows_without_nested_serializers(self):
+        cv = CV.objects.create(**self.cv_data)
+        for i, is_featured in enumerate((True, False, False)):
+            Skill.objects.create(cv=cv, name=f'Skill {i}', category='technical')
+            Project.objects.create(
+                cv=cv, title=f'Project {i}', description='Test', start_date='2024-01-01', is_featured=is_featured
+            )
+
+        with patch.object(SkillSerializer, 'to_representation', autospec=True,
+                          side_effect=SkillSerializer.to_representation) as skill_repr, \
+                patch.object(ProjectSerializer, 'to_representation', autospec=True,
+                             side_effect=ProjectSerializer.to_representation) as project_repr:
+            response = self.client.get(f'/api/cvs/{cv.pk}/')
+
+        self.assertEqual(skill_repr.call_count, 0)
+        self.assertEqual(project_repr.call_count, 0)
+        self.assertEqual(len(response.data['skills_by_category']['Technical']), 3)
+        self.assertEqual(len(response.data['featured_projects']) + len(response.data['other_projects']), 3)
+
+    def test_cv_detail_values_rows_match_nested_serializers(self):
+        cv = CV.objects.create(**self.cv_data)
+        Skill.objects.create(cv=cv, name='Python', category='technical', proficiency_level=4, description='Daily')
+        Skill.objects.create(cv=cv, name='English', category='language')
+        Project.objects.create(
+            cv=cv, title='Done', description='Test', start_date='2023-01-01', end_date='2023-06-01',
+            technologies_used='Python, Django', project_url='https://example.com', is_featured=True
+        )
+        Project.objects.create(cv=cv, title='Ongoing', description='Test', start_date='2024-01-01')
+        Contact.objects.create(cv=cv, contact_type='email', value='john@example.com', is_primary=True)
+        Contact.objects.create(cv=cv, contact_type='phone', value='+1234567890', is_public=False)
+
+        response = self.client.get(f'/api/cvs/{cv.pk}/')
+
+        cv = CV.objects.prefetch_related(
+            Prefetch('projects', queryset=Project.objects.order_by('-is_featured', '-start_date')),
+            Prefetch('contacts', queryset=Contact.objects.filter(is_public=True)),
+        ).get(pk=cv.pk)
+        expected = CVDetailSerializer(cv).data
+        self.assertEqual(json.loads(response.content), json.loads(JSONRenderer().render(expected)))
+
+    @skipUnless(connection.vendor == 'postgresql', 'JSON aggregation path is PostgreSQL-only')
+    def test_cv_detail_single_query_on_postgresql(self):
+        cv = CV.objects.create(**self.cv_data)
+        Skill.objects.create(cv=cv, name='Python', category='technical')
+        Project.objects.create(cv=cv, title='Project', description='Test', start_date='2024-01-01')
+        Contact.objects.create(cv=cv, contact_type='email', value='john@example.com')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/cvs/{cv.pk}/')
+
+        cv_queries = [q for q in ctx.captured_queries if '"main_' in q['sql']]
+        self.assertEqual(len(cv_queries), 1)
+        self.assertEqual(response.data['skills'][0]['name'], 'Python')
+        self.assertEqual(response.data['projects'][0]['start_date'], '2024-01-01')
+        self.assertEqual(len(response.data['contacts']), 1)
+
+    def test_cv_detail_lists_primary_contact_first_within_type(self):
+        cv = CV.objects.create(**self.cv_data)
+        Contact.objects.create(cv=cv, contact_type='phone', value='+1234567890')
+        Contact.objects.create(cv=cv, contact_type='email', value='work@example.com')
+        Contact.objects.create(cv=cv, contact_type='email', value='john@example.com', is_primary=True)
+
+        response = self.client.get(f'/api/cvs/{cv.pk}/')
+
+        self.assertEqual(
+            [contact['value'] for contact in response.data['contacts']],
+            ['john@example.com', 'work@example.com', '+1234567890']
+        )
+
+    def test_cv_detail_actions_query_count_stays_flat(self):
+        cv = CV.objects.create(**self.cv_data)
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                for action in ('skills', 'projects', 'contacts'):
+                    self.client.get(f'/api/cvs/{cv.pk}/{action}/')
+            return len(ctx.captured_queries)
+
+        baseline = count_queries()
+        for i, contact_type in enumerate(('email', 'phone', 'github')):
+            Skill.objects.create(cv=cv, name=f'Skill {i}', category='technical')
+            Project.objects.create(cv=cv, title=f'Project {i}', description='Test', start_date='2024-01-01')
+            Contact.objects.create(cv=cv, contact_type=contact_type, value=f'contact-{i}')
+
+        self.assertEqual(count_queries(), baseline)
+
     def test_cv_filtering_by_status(self):
         CV.objects.create(**self.cv_data)
         draft_cv = CV.objects.create(
@@ -383,6 +699,19 @@ class ProjectAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
 
+    def test_project_list_skips_long_text_columns(self):
+        Project.objects.create(cv=self.cv, **{k: v for k, v in self.project_data.items() if k != 'cv'})
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/projects/', {'search': 'Django'})
+
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertNotIn('description', response.data['results'][0])
+        list_sql = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT "main_project"."id"')]
+        self.assertEqual(len(list_sql), 1)
+        self.assertNotIn('"main_project"."description",', list_sql[0].split(' FROM ')[0])
+        self.assertNotIn('"main_project"."technologies_used"', list_sql[0].split(' FROM ')[0])
+
     def test_project_retrieve(self):
         project = Project.objects.create(cv=self.cv, **{k: v for k, v in self.project_data.items() if k != 'cv'})
         response = self.client.get(f'/api/projects/{project.pk}/')
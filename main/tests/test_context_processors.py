@@ -1,20 +1,25 @@
-from django.test import TestCase, RequestFactory
+from django.test import TestCase, RequestFactory, override_settings
 from django.contrib.auth.models import User
 from django.template import Context, Template
 from django.conf import settings
+from unittest.mock import patch
 
-from ..context_processors import settings_context
+from .. import context_processors
+from ..context_processors import settings_context, debug_settings_context
 
 
 class SettingsContextProcessorTestCase(TestCase):
-    def setUp(self):
-        self.factory = RequestFactory()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
 
+    def setUp(self):
+        self.factory = RequestFactory()
+
     def test_settings_context_processor_returns_dict(self):
         """Test that settings_context processor returns a dictionary."""
         request = self.factory.get('/')
@@ -141,25 +146,35 @@ class SettingsContextProcessorTestCase(TestCase):
             self.assertTrue(secret_key.endswith('...'))
             self.assertLess(len(secret_key), len(settings.SECRET_KEY))
 
-    def test_settings_context_installed_apps_included(self):
-        """Test that INSTALLED_APPS is included in settings context."""
+    def test_settings_context_excludes_bulky_settings(self):
+        """Test that app, middleware, cache and logging config stay out of every render."""
         request = self.factory.get('/')
         request.user = self.user
 
-        context = settings_context(request)
-        settings_dict = context['settings']
+        settings_dict = settings_context(request)['settings']
+
+        for key in ('INSTALLED_APPS', 'MIDDLEWARE', 'CACHES', 'LOGGING'):
+            self.assertNotIn(key, settings_dict)
+
+    def test_debug_settings_context_installed_apps_included(self):
+        """Test that INSTALLED_APPS is included in the debug settings context."""
+        request = self.factory.get('/')
+        request.user = self.user
+
+        context = debug_settings_context(request)
+        settings_dict = context['debug_settings']
 
         self.assertIn('INSTALLED_APPS', settings_dict)
         self.assertIsInstance(settings_dict['INSTALLED_APPS'], list)
         self.assertIn('django.contrib.admin', settings_dict['INSTALLED_APPS'])
 
-    def test_settings_context_middleware_included(self):
-        """Test that MIDDLEWARE is included in settings context."""
+    def test_debug_settings_context_middleware_included(self):
+        """Test that MIDDLEWARE is included in the debug settings context."""
         request = self.factory.get('/')
         request.user = self.user
 
-        context = settings_context(request)
-        settings_dict = context['settings']
+        context = debug_settings_context(request)
+        settings_dict = context['debug_settings']
 
         self.assertIn('MIDDLEWARE', settings_dict)
         self.assertIsInstance(settings_dict['MIDDLEWARE'], list)
@@ -230,3 +245,27 @@ class SettingsContextProcessorTestCase(TestCase):
         self.assertIn('settings', context)
         settings_dict = context['settings']
         self.assertIn('DEBUG', settings_dict)
+
+    def test_settings_context_static_part_built_once(self):
+        """Test that request-independent settings are not rebuilt per render."""
+        request = self.factory.get('/')
+        settings_context(request)
+
+        with patch.object(context_processors, '_build_static_settings') as build:
+            first = settings_context(request)['settings']
+            second = settings_context(self.factory.post('/other/'))['settings']
+
+        build.assert_not_called()
+        self.assertEqual(first['TIME_ZONE'], settings.TIME_ZONE)
+        self.assertEqual(second['PATH_INFO'], '/other/')
+        self.assertEqual(first['PATH_INFO'], '/')
+
+    def test_settings_context_follows_overridden_settings(self):
+        """Test that overriding a setting refreshes the precomputed values."""
+        request = self.factory.get('/')
+        settings_context(request)
+
+        with override_settings(TIME_ZONE='Europe/Kyiv'):
+            self.assertEqual(settings_context(request)['settings']['TIME_ZONE'], 'Europe/Kyiv')
+
+        self.assertEqual(settings_context(request)['settings']['TIME_ZONE'], settings.TIME_ZONE)
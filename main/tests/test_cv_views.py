@@ -0,0 +1,30 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from ..models import CV, Skill, Project
+
+
+class CVListViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cv = CV.objects.create(
+            first_name='John',
+            last_name='Doe',
+            bio='Test bio',
+            status='published'
+        )
+        for name in ('Python', 'Django'):
+            Skill.objects.create(cv=cls.cv, name=name, category='technical')
+        for title in ('Project A', 'Project B', 'Project C'):
+            Project.objects.create(cv=cls.cv, title=title, description='Test', start_date='2024-01-01')
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_cv_list_counts_are_not_multiplied(self):
+        response = self.client.get(reverse('main:cv_list'))
+
+        self.assertEqual(response.status_code, 200)
+        cv = response.context['cvs'][0]
+        self.assertEqual(cv.skills_count, 2)
+        self.assertEqual(cv.projects_count, 3)
@@ -0,0 +1,149 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from ..models import CV, Skill, Project, Technology, Contact
+
+
+class CVManagerRelatedFiltersTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.both = CV.objects.create(first_name='John', last_name='Doe', bio='Test bio')
+        for name in ('Python', 'Django'):
+            Skill.objects.create(cv=cls.both, name=name, category='technical')
+        for title, is_featured in (('Project A', True), ('Project B', True), ('Project C', False)):
+            Project.objects.create(
+                cv=cls.both, title=title, description='Test', start_date='2024-01-01', is_featured=is_featured
+            )
+
+        cls.skills_only = CV.objects.create(first_name='Jane', last_name='Smith', bio='Test bio')
+        Skill.objects.create(cv=cls.skills_only, name='Python', category='technical')
+
+        cls.unfeatured = CV.objects.create(first_name='Alex', last_name='Johnson', bio='Test bio')
+        Project.objects.create(cv=cls.unfeatured, title='Project D', description='Test', start_date='2024-01-01')
+
+        cls.empty = CV.objects.create(first_name='Sam', last_name='Lee', bio='Test bio')
+
+    def test_with_skills(self):
+        self.assertCountEqual(CV.objects.with_skills(), [self.both, self.skills_only])
+
+    def test_with_projects(self):
+        self.assertCountEqual(CV.objects.with_projects(), [self.both, self.unfeatured])
+
+    def test_featured_projects(self):
+        self.assertEqual(list(CV.objects.featured_projects()), [self.both])
+
+    def test_has_skills_and_has_projects(self):
+        self.assertTrue(Skill.objects.has_skills(self.skills_only))
+        self.assertFalse(Skill.objects.has_skills(self.unfeatured))
+        self.assertTrue(Project.objects.has_projects(self.unfeatured))
+        self.assertFalse(Project.objects.has_projects(self.empty))
+
+        with CaptureQueriesContext(connection) as ctx:
+            Skill.objects.has_skills(self.both)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn('LIMIT 1', ctx.captured_queries[0]['sql'])
+
+    def test_related_filters_use_exists_without_distinct(self):
+        for queryset in (CV.objects.with_skills(), CV.objects.with_projects(), CV.objects.featured_projects()):
+            with CaptureQueriesContext(connection) as ctx:
+                list(queryset)
+            sql = ctx.captured_queries[0]['sql']
+            self.assertIn('EXISTS', sql)
+            self.assertNotIn('DISTINCT', sql)
+
+
+class CVPrimaryContactTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cv = CV.objects.create(first_name='John', last_name='Doe', bio='Test bio')
+        cls.email = Contact.objects.create(cv=cls.cv, contact_type='email', value='john@example.com', is_primary=True)
+        Contact.objects.create(cv=cls.cv, contact_type='email', value='other@example.com', is_primary=False)
+        Contact.objects.create(cv=cls.cv, contact_type='phone', value='+1234567890', is_primary=False)
+
+    def test_get_primary_contact_without_prefetch(self):
+        self.assertEqual(self.cv.get_primary_contact('email'), self.email)
+        self.assertIsNone(self.cv.get_primary_contact('phone'))
+
+    def test_get_primary_contact_uses_prefetch(self):
+        cv = CV.objects.with_primary_contacts().get(pk=self.cv.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(cv.get_primary_contact('email'), self.email)
+            self.assertIsNone(cv.get_primary_contact('phone'))
+            self.assertIsNone(cv.get_primary_contact('github'))
+
+
+class ProjectTechnologyTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cv = CV.objects.create(first_name='John', last_name='Doe', bio='Test bio')
+        cls.web = Project.objects.create(
+            cv=cls.cv, title='Web app', description='Test', start_date='2024-01-01',
+            technologies_used='Django, React , PostgreSQL,, Django'
+        )
+        cls.infra = Project.objects.create(
+            cv=cls.cv, title='Infra', description='Test', start_date='2024-01-01',
+            technologies_used='Docker, PostgreSQL'
+        )
+
+    def test_save_links_technologies(self):
+        self.assertEqual(
+            sorted(self.web.technologies.values_list('name', flat=True)), ['Django', 'PostgreSQL', 'React']
+        )
+        self.assertEqual(Technology.objects.count(), 4)
+
+    def test_saving_new_csv_relinks(self):
+        self.infra.technologies_used = 'Terraform'
+        self.infra.save()
+        self.assertEqual(list(self.infra.technologies.values_list('name', flat=True)), ['Terraform'])
+
+    def test_saving_other_fields_skips_relink(self):
+        for project in (self.infra, Project.objects.get(pk=self.infra.pk)):
+            project.status = 'in_progress'
+            with self.assertNumQueries(1):
+                project.save()
+        self.assertEqual(self.infra.technologies.count(), 2)
+
+    def test_by_technology_matches_substrings(self):
+        self.assertCountEqual(Project.objects.by_technology('Postgre'), [self.web, self.infra])
+        self.assertEqual(list(Project.objects.by_technology('rea')), [self.web])
+
+    def test_with_technology_matches_whole_names(self):
+        self.assertCountEqual(Project.objects.with_technology('postgresql'), [self.web, self.infra])
+        self.assertEqual(list(Project.objects.with_technology('react')), [self.web])
+        self.assertFalse(Project.objects.with_technology('Postgre').exists())
+
+    def test_with_technology_returns_each_project_once(self):
+        self.infra.technologies_used = 'Docker, docker'
+        self.infra.save()
+        self.assertEqual(list(Project.objects.with_technology('DOCKER')), [self.infra])
+
+    def test_overlong_technology_names_are_rejected_not_truncated(self):
+        long_name = 'x' * 65
+        self.infra.technologies_used = f'Docker, {long_name}'
+        self.assertEqual(self.infra.technology_names, ['Docker', long_name])
+        with self.assertRaises(ValidationError) as ctx:
+            self.infra.full_clean()
+        self.assertIn('technologies_used', ctx.exception.message_dict)
+
+
+class SkillProficiencyTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cv = CV.objects.create(first_name='John', last_name='Doe', bio='Test bio')
+        for level in range(1, 6):
+            Skill.objects.create(cv=cv, name=f'Skill {level}', category='technical', proficiency_level=level)
+
+    def levels(self, queryset):
+        return sorted(queryset.values_list('proficiency_level', flat=True))
+
+    def test_by_proficiency_bounds(self):
+        self.assertEqual(self.levels(Skill.objects.by_proficiency(2, 4)), [2, 3, 4])
+        self.assertEqual(self.levels(Skill.objects.by_proficiency(min_level=4)), [4, 5])
+        self.assertEqual(self.levels(Skill.objects.by_proficiency(max_level=2)), [1, 2])
+
+    def test_by_proficiency_full_range_adds_no_where(self):
+        self.assertNotIn('WHERE', str(Skill.objects.by_proficiency().query))
+        self.assertNotIn('"proficiency_level" <=', str(Skill.objects.by_proficiency(min_level=3).query))
@@ -0,0 +1,33 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from ..models import Contact
+
+
+class ContactCleanTestCase(SimpleTestCase):
+    def test_valid_email(self):
+        Contact(contact_type='email', value='john@example.com').clean()
+
+    def test_invalid_email(self):
+        with self.assertRaises(ValidationError):
+            Contact(contact_type='email', value='not-an-email').clean()
+
+    def test_valid_phone_numbers(self):
+        for value in ('+1 234-567-890', '1234567890', '+380 44 123 4567'):
+            with self.subTest(value=value):
+                Contact(contact_type='phone', value=value).clean()
+
+    def test_invalid_phone_numbers(self):
+        for value in ('', '+- ', 'call me', '123abc', '(123) 456'):
+            with self.subTest(value=value):
+                with self.assertRaises(ValidationError):
+                    Contact(contact_type='phone', value=value).clean()
+
+    def test_url_contact_types_get_scheme(self):
+        contact = Contact(contact_type='github', value='github.com/johndoe')
+        contact.clean()
+        self.assertEqual(contact.value, 'https://github.com/johndoe')
+
+        contact = Contact(contact_type='website', value='http://example.com')
+        contact.clean()
+        self.assertEqual(contact.value, 'http://example.com')
@@ -0,0 +1,98 @@
+from django.db.models import Prefetch
+from django.test import TestCase
+from reportlab.platypus import Paragraph
+
+from ..models import CV, Skill, Project, Contact
+from ..services.pdf_service import CVPDFGenerator, PDFService, prepare_cv_data
+
+
+class PDFServiceTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cv = CV.objects.create(first_name='John', last_name='Doe', bio='Test bio', status='published')
+        Skill.objects.create(cv=cls.cv, name='Python', category='technical', proficiency_level=5)
+        Project.objects.create(cv=cls.cv, title='Project', description='Test', start_date='2024-01-01')
+        Contact.objects.create(cv=cls.cv, contact_type='email', value='john@example.com')
+        Contact.objects.create(cv=cls.cv, contact_type='phone', value='+1234567890', is_public=False)
+
+    def test_services_share_default_generator(self):
+        self.assertIs(PDFService().generator, PDFService().generator)
+
+    def test_generators_share_styles(self):
+        self.assertIs(CVPDFGenerator().styles, CVPDFGenerator().styles)
+        self.assertIn('CVTitle', CVPDFGenerator().styles)
+
+    def test_custom_generator_is_kept(self):
+        generator = CVPDFGenerator()
+        self.assertIs(PDFService(generator).generator, generator)
+
+    def test_generate_cv_pdf(self):
+        response = PDFService().generate_cv_pdf(self.cv)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(response.content.startswith(b'%PDF'))
+
+    def test_generate_cv_pdf_inline(self):
+        response = PDFService().generate_cv_pdf_inline(self.cv)
+        self.assertEqual(response['Content-Disposition'], 'inline; filename="John_Doe_CV.pdf"')
+        self.assertTrue(response.content.startswith(b'%PDF'))
+
+    def test_generate_returns_bytes(self):
+        pdf = CVPDFGenerator().generate(self.cv)
+        self.assertIsInstance(pdf, bytes)
+        self.assertTrue(pdf.startswith(b'%PDF'))
+
+    def test_prefetched_cv_renders_without_queries(self):
+        cv = CV.objects.for_pdf().get(pk=self.cv.pk)
+        with self.assertNumQueries(0):
+            CVPDFGenerator().generate(cv)
+
+    def test_private_contacts_are_left_out(self):
+        generator = CVPDFGenerator()
+        for cv in (self.cv, CV.objects.for_pdf().get(pk=self.cv.pk)):
+            table = generator._build_contact_info(prepare_cv_data(cv))[1]
+            self.assertEqual(table._cellvalues, [['Email', 'john@example.com']])
+
+    def test_skills_grouped_once_per_category(self):
+        Skill.objects.create(cv=self.cv, name='English', category='language')
+        Skill.objects.create(cv=self.cv, name='Django', category='technical')
+        cv = CV.objects.prefetch_related(Prefetch('skills', queryset=Skill.objects.order_by('name'))).get(pk=self.cv.pk)
+
+        story = CVPDFGenerator()._build_skills(prepare_cv_data(cv))
+
+        headers = [item.text for item in story if isinstance(item, Paragraph) and item.text.startswith('<b>')]
+        self.assertEqual(headers, ['<b>Languages</b>', '<b>Technical</b>'])
+
+    def test_project_info_is_one_paragraph(self):
+        Project.objects.filter(cv=self.cv).update(technologies_used='Python, Django', status='completed')
+        cv = CV.objects.for_pdf().get(pk=self.cv.pk)
+
+        story = CVPDFGenerator()._build_projects(prepare_cv_data(cv))
+
+        paragraphs = [item for item in story if isinstance(item, Paragraph)]
+        self.assertEqual(len(paragraphs), 4)
+        self.assertEqual(paragraphs[2].text.count('<br/>'), 2)
+
+    def test_prepare_cv_data_resolves_display_labels(self):
+        Project.objects.filter(cv=self.cv).update(status='in_progress')
+        cv = CV.objects.for_pdf().get(pk=self.cv.pk)
+
+        with self.assertNumQueries(0):
+            data = prepare_cv_data(cv)
+
+        self.assertEqual(data['full_name'], 'John Doe')
+        self.assertEqual(data['contacts'], [{'type': 'Email', 'value': 'john@example.com'}])
+        self.assertEqual(data['skills'][0]['category'], 'Technical')
+        self.assertEqual(data['projects'][0]['status'], 'In Progress')
+        self.assertEqual(data['projects'][0]['duration'], 'January 2024 - Present')
+
+    def test_skill_lines_keep_their_separate_paragraph_pitch(self):
+        Skill.objects.create(cv=self.cv, name='Django', category='technical')
+        Skill.objects.create(cv=self.cv, name='SQL', category='technical')
+        generator = CVPDFGenerator()
+        data = prepare_cv_data(CV.objects.for_pdf().get(pk=self.cv.pk))
+
+        skills = generator._build_skills(data)[2]
+        item_style = generator.styles['SkillItem']
+        one_per_line = 3 * (Paragraph('• Python (5/5)', item_style).wrap(400, 1000)[1] + item_style.spaceAfter)
+
+        self.assertEqual(skills.wrap(400, 1000)[1] + skills.style.spaceAfter, one_per_line)
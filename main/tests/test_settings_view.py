@@ -6,20 +6,20 @@ from ..views import SettingsView
 
 
 class SettingsViewTestCase(TestCase):
-    def setUp(self):
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
-        self.staff_user = User.objects.create_user(
+        cls.staff_user = User.objects.create_user(
             username='staffuser',
             email='staff@example.com',
             password='testpass123',
             is_staff=True
         )
-        self.superuser = User.objects.create_user(
+        cls.superuser = User.objects.create_user(
             username='superuser',
             email='super@example.com',
             password='testpass123',
@@ -27,6 +27,9 @@ class SettingsViewTestCase(TestCase):
             is_superuser=True
         )
 
+    def setUp(self):
+        self.client = Client()
+
     def test_settings_view_requires_login(self):
         """Test that settings view requires authentication."""
         response = self.client.get(reverse('main:settings'))
@@ -0,0 +1,147 @@
+import threading
+from smtplib import SMTPServerDisconnected
+from unittest.mock import patch
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+
+from ..models import CV, Skill
+from ..services.pdf_service import CVPDFGenerator
+from .. import tasks
+from ..tasks import cv_pdf_cache_key, get_cv_pdf, send_cv_pdf_email, send_cv_pdf_emails_batch
+
+
+class SendCVPDFEmailTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cvs = [
+            CV.objects.create(first_name=name, last_name='Doe', bio='Test bio', status='published')
+            for name in ('John', 'Jane', 'Alex')
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(tasks._close_shared_connection)
+
+    def test_single_email(self):
+        result = send_cv_pdf_email(self.cvs[0].pk, 'to@example.com', 'Sender')
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'CV of John Doe')
+        self.assertEqual(
+            mail.outbox[0].body,
+            'Hello,\n\nPlease find attached the CV of John Doe.\n\nBest regards,\nSender'
+        )
+        self.assertEqual(mail.outbox[0].attachments[0][0], 'John_Doe_CV.pdf')
+
+    def test_single_emails_share_one_connection(self):
+        with patch.object(tasks, 'get_connection', wraps=tasks.get_connection) as get_connection:
+            for cv in self.cvs:
+                self.assertEqual(send_cv_pdf_email(cv.pk, 'to@example.com')['status'], 'success')
+
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_single_email_reconnects_after_disconnect(self):
+        send_messages = EmailBackend.send_messages
+        attempts = []
+
+        def drop_first_attempt(backend, messages):
+            attempts.append(messages)
+            if len(attempts) == 1:
+                raise SMTPServerDisconnected()
+            return send_messages(backend, messages)
+
+        with patch.object(EmailBackend, 'send_messages', autospec=True, side_effect=drop_first_attempt), \
+                patch.object(EmailBackend, 'open', autospec=True) as open_connection:
+            result = send_cv_pdf_email(self.cvs[0].pk, 'to@example.com')
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(open_connection.call_count, 2)
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(len(mail.outbox), 1)
+
+    @override_settings(CV_EMAIL_BATCH_SIZE=2)
+    def test_batch_opens_one_connection_per_chunk(self):
+        jobs = [(cv.pk, f'{cv.first_name.lower()}@example.com', None) for cv in self.cvs]
+
+        with patch.object(EmailBackend, 'open', autospec=True, return_value=True) as open_connection:
+            result = send_cv_pdf_emails_batch(jobs)
+
+        self.assertEqual(result, {'status': 'success', 'sent': 3, 'failed': []})
+        self.assertEqual(open_connection.call_count, 2)
+        self.assertEqual([m.to for m in mail.outbox], [['john@example.com'], ['jane@example.com'], ['alex@example.com']])
+        self.assertTrue(mail.outbox[0].body.endswith('Best regards,\nCV Project Team'))
+
+    def test_batch_reports_missing_cvs(self):
+        jobs = [(cv.pk, 'to@example.com', None) for cv in self.cvs] + [(0, 'to@example.com', None)]
+
+        result = send_cv_pdf_emails_batch(jobs)
+
+        self.assertEqual(result, {'status': 'partial', 'sent': 3, 'failed': [0]})
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_batch_aborts_after_a_third_fail(self):
+        jobs = [(0, 'to@example.com', None), (-1, 'to@example.com', None)] + [
+            (cv.pk, 'to@example.com', None) for cv in self.cvs
+        ]
+
+        result = send_cv_pdf_emails_batch(jobs)
+
+        self.assertEqual(result['status'], 'aborted')
+        self.assertEqual(result['failed'], [0, -1])
+        self.assertEqual(mail.outbox, [])
+
+    def test_small_batch_survives_one_failure(self):
+        jobs = [(0, 'to@example.com', None), (self.cvs[0].pk, 'to@example.com', None)]
+
+        result = send_cv_pdf_emails_batch(jobs)
+
+        self.assertEqual(result, {'status': 'partial', 'sent': 1, 'failed': [0]})
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_batch_renders_pdfs_off_the_calling_thread(self):
+        render_threads = []
+
+        def generate(generator, cv):
+            render_threads.append(threading.get_ident())
+            return b'%PDF-1'
+
+        jobs = [(cv.pk, 'to@example.com', None) for cv in self.cvs]
+        with patch.object(CVPDFGenerator, 'generate', autospec=True, side_effect=generate):
+            result = send_cv_pdf_emails_batch(jobs)
+
+        self.assertEqual(result['sent'], len(jobs))
+        self.assertEqual(len(render_threads), len(jobs))
+        self.assertNotIn(threading.get_ident(), render_threads)
+        self.assertEqual([m.attachments[0][1] for m in mail.outbox], [b'%PDF-1'] * len(jobs))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CVPDFCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cv = CV.objects.create(first_name='John', last_name='Doe', bio='Test bio', status='published')
+
+    def test_unchanged_cv_renders_once(self):
+        with patch.object(CVPDFGenerator, 'generate', autospec=True, return_value=b'%PDF-1') as generate:
+            self.assertEqual(get_cv_pdf(self.cv), b'%PDF-1')
+            self.assertEqual(get_cv_pdf(self.cv), b'%PDF-1')
+        self.assertEqual(generate.call_count, 1)
+
+    def test_key_follows_content(self):
+        key = cv_pdf_cache_key(self.cv)
+        self.assertEqual(cv_pdf_cache_key(CV.objects.get(pk=self.cv.pk)), key)
+
+        skill = Skill.objects.create(cv=self.cv, name='Python', category='technical')
+        with_skill = cv_pdf_cache_key(self.cv)
+        self.assertNotEqual(with_skill, key)
+
+        skill.proficiency_level = 5
+        skill.save()
+        self.assertNotEqual(cv_pdf_cache_key(self.cv), with_skill)
+
+        self.cv.bio = 'Changed'
+        self.assertNotEqual(cv_pdf_cache_key(self.cv), key)
@@ -1,3 +1,4 @@
+from collections import OrderedDict, namedtuple
 from django.test import TestCase
 from django.template import Context, Template
 from django.contrib.auth.models import User
@@ -8,8 +9,9 @@ from ..templatetags.settings_extras import (
 
 
 class TemplateTagsTestCase(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
@@ -101,6 +103,13 @@ class TemplateTagsTestCase(TestCase):
         self.assertEqual(format_setting_value(123), '123')
         self.assertEqual(format_setting_value(123.45), '123.45')
 
+    def test_format_setting_value_subclasses(self):
+        """Test format_setting_value filter with subclasses of the handled types."""
+        Point = namedtuple('Point', 'x y')
+        self.assertEqual(format_setting_value(Point(1, 2)), '[1, 2]')
+        self.assertEqual(format_setting_value(OrderedDict(a=1)), '{ a: 1 }')
+        self.assertEqual(format_setting_value(Point(3, 4)), '[3, 4]')
+
     def test_lookup_filter_in_template(self):
         """Test lookup filter in Django template."""
         template_string = """
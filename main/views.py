@@ -29,8 +29,9 @@ def cv_list_view(request):
         Prefetch('projects', queryset=Project.objects.select_related()),
         Prefetch('contacts', queryset=Contact.objects.filter(is_public=True))
     ).annotate(
-        skills_count=Count('skills'),
-        projects_count=Count('projects')
+        # distinct: joining skills and projects together multiplies the rows each count sees
+        skills_count=Count('skills', distinct=True),
+        projects_count=Count('projects', distinct=True)
     ).order_by('-created_at')
 
     context = {